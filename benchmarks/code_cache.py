@@ -0,0 +1,72 @@
+"""
+| Cold vs warm **ModuleLoaderImpl.reload_all** on generated package
+| Usage: python benchmarks/code_cache.py [modules count] [functions per module]
+"""
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PySimplePreview.data.config_storage import ConfigStorage
+from PySimplePreview.data.preview_index_storage import PreviewIndexStorage
+from PySimplePreview.domain.interactor.code_cache import CodeCache
+from PySimplePreview.domain.interactor.files_observer import ProjectObserverImpl
+from PySimplePreview.domain.interactor.module_loader import ModuleLoaderImpl
+from PySimplePreview.domain.model.source_index import SourceIndex
+from PySimplePreview.domain.model.tracing import Tracer
+from PySimplePreview.domain.model.wakeup import Wakeup
+
+
+def generate_package(root: Path, modules: int, functions: int):
+    package = root.joinpath("generated")
+    package.mkdir()
+    package.joinpath("__init__.py").write_text("")
+    for i in range(modules):
+        body = "\n\n".join(
+            f"def function_{j}(value={j}):\n"
+            f"    result = [value * k for k in range({j % 7 + 3})]\n"
+            f"    if sum(result) % 2:\n"
+            f"        return {{'module': {i}, 'function': {j}, 'result': result}}\n"
+            f"    return tuple(str(x) for x in result)\n"
+            for j in range(functions)
+        )
+        package.joinpath(f"module_{i}.py").write_text(body)
+    return package.joinpath("__init__.py")
+
+
+def measure(loader: ModuleLoaderImpl, project: Path):
+    start = time.perf_counter()
+    loader.reload_all(project)
+    return time.perf_counter() - start
+
+
+def main():
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    functions = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    sys.dont_write_bytecode = True  # Cold run must really compile everything
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        project = generate_package(root, modules, functions)
+        config = ConfigStorage(str(root.joinpath("config.json")))
+        config.save(False)
+        config.flush()  # Saves are write-behind, file must exist before config is loaded
+        tracer = Tracer()
+        loader = ModuleLoaderImpl(
+            config,
+            ProjectObserverImpl(config, Wakeup(), SourceIndex(), tracer),
+            SourceIndex(),
+            CodeCache(),
+            PreviewIndexStorage(config),
+            tracer,
+        )
+        cold = measure(loader, project)
+        warm = min(measure(loader, project) for _ in range(3))
+        print(f"Package: {modules} modules x {functions} functions")
+        print(f"Cold reload_all: {cold * 1000:.1f} ms")
+        print(f"Warm reload_all: {warm * 1000:.1f} ms ({cold / warm:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+| Config save/load with `jsons` vs precompiled codec (same file format)
+| Usage: python benchmarks/config_codec.py [positions count] [repeat]
+"""
+import sys
+import time
+from pathlib import Path
+
+import jsons
+
+from PySimplePreview.data.config_codec import dumps_config, loads_config
+from PySimplePreview.domain.model.config import Config
+from PySimplePreview.domain.model.log_config import LogConfig
+from PySimplePreview.domain.model.position import Position
+
+
+def make_config(positions: int):
+    config = Config(theme="DarkBlue")
+    config.logging = LogConfig(level=LogConfig.LoggingLevel.DEBUG)
+    config.projects = (Path(__file__).resolve(),)
+    config.current_project = config.projects[0]
+    for i in range(positions):
+        config.positions[f"ExternalPreviewWindowController|package.module_{i}.preview_{i}"] = Position(
+            (400 + i, 300 + i) if i % 3 else None,
+            (i, i * 2),
+        )
+    return config
+
+
+def measure(action, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    positions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    config = make_config(positions)
+    jsons_text = jsons.dumps(config, strip_nulls=True, jdkwargs=dict(indent=2))
+    codec_text = dumps_config(config)
+    if jsons_text != codec_text:
+        print("Formats differ!")
+        return 1
+    if loads_config(jsons_text) != jsons.loads(jsons_text, Config):
+        print("Loaded configs differ!")
+        return 1
+    timings = dict(
+        jsons_save=measure(lambda: jsons.dumps(config, strip_nulls=True, jdkwargs=dict(indent=2)), repeat),
+        codec_save=measure(lambda: dumps_config(config), repeat),
+        jsons_load=measure(lambda: jsons.loads(jsons_text, Config), repeat),
+        codec_load=measure(lambda: loads_config(codec_text), repeat),
+    )
+    print(f"Config with {positions} positions ({len(codec_text) // 1024} KiB), same output for both")
+    for operation in ("save", "load"):
+        old, new = timings[f"jsons_{operation}"], timings[f"codec_{operation}"]
+        print(f"{operation.title()}: jsons {old:8.2f} ms, codec {new:8.2f} ms ({old / new:.1f}x faster)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
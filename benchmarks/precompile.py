@@ -0,0 +1,59 @@
+"""
+| Serial vs process pool compilation of generated package by **CodeCache.precompile**
+| Also measures startup of pool workers, to estimate break-even module count for CPU counts
+| this machine doesn't have
+| Usage: python benchmarks/precompile.py [modules count] [functions per module] [workers]
+"""
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from code_cache import generate_package
+from PySimplePreview.domain.interactor.code_cache import CodeCache, _compile_to_bytes
+
+
+def measure(modules: list[Path], workers: int):
+    cache = CodeCache()
+    start = time.perf_counter()
+    errors = cache.precompile(modules, workers)
+    assert not errors and len(cache) == len(modules)
+    return time.perf_counter() - start
+
+
+def measure_startup(workers: int):
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        list(pool.map(_compile_to_bytes, ["<empty>"] * workers, [b""] * workers))
+    return time.perf_counter() - start
+
+
+def main():
+    modules_count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    functions = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else max(2, os.cpu_count() or 1)
+    sys.dont_write_bytecode = True
+    logging.disable(logging.INFO)
+    CodeCache.PARALLEL_COMPILE_THRESHOLD = 1
+    with tempfile.TemporaryDirectory() as directory:
+        package = generate_package(Path(directory), modules_count, functions).parent
+        modules = sorted(package.glob("*.py"))
+        serial = min(measure(modules, 1) for _ in range(3))
+        pool = min(measure(modules, workers) for _ in range(2))
+        startup = min(measure_startup(workers) for _ in range(2))
+    per_module = serial / len(modules)
+    print(f"Package: {len(modules)} modules x {functions} functions, {os.cpu_count()} CPU(s)")
+    print(f"Serial compile: {serial * 1000:8.1f} ms ({per_module * 1000:.2f} ms per module)")
+    print(f"Pool compile:   {pool * 1000:8.1f} ms ({workers} workers, startup {startup * 1000:.1f} ms)")
+    for cpus in (2, 4, 8):
+        # Pool pays off, when compile time saved by other CPUs exceeds workers startup
+        break_even = startup / (per_module * (1 - 1 / cpus))
+        print(f"Estimated break-even with {cpus} CPUs: {break_even:6.0f} modules")
+
+
+if __name__ == '__main__':
+    main()
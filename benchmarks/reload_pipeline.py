@@ -0,0 +1,162 @@
+"""
+| Timings of reload pipeline stages on generated project:
+| project open (with previews index), **ModuleLoaderImpl.load_any**, **reload_all**, single module **load_module(reload=True)**,
+| **PreviewsManager.remove_module** and **shorten_preview_names**
+| Results are saved as JSON, so releases can be compared with **--compare**
+| Usage: python benchmarks/reload_pipeline.py [-m modules] [-p previews] [-d depth] [-o results.json]
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+import punq
+
+import PySimplePreview
+from PySimplePreview import di
+from PySimplePreview.data.config_storage import ConfigStorage
+from PySimplePreview.data.previews_storage import PreviewsStorage
+from PySimplePreview.domain.interactor.abc.module_loader import ModuleLoader
+from PySimplePreview.view.app import Application
+from PySimplePreview.view.models import shorten_preview_names
+
+
+def generate_project(root: Path, modules: int, previews: int, depth: int):
+    """
+    | Package of **modules** with **previews** each,
+    | every module imports previous one, so import chains are **depth** modules long
+    """
+    package = root.joinpath("generated")
+    package.mkdir()
+    package.joinpath("__init__.py").write_text("")
+    for i in range(modules):
+        imports = f"import module_{i - 1}\n" if i % depth else ""
+        body = "\n\n".join(
+            f"@preview\n"
+            f"def preview_{j}():\n"
+            f"    return [[{{'module': {i}, 'preview': {j}}}]]\n"
+            for j in range(previews)
+        )
+        package.joinpath(f"module_{i}.py").write_text(
+            f"from PySimplePreview import preview\n{imports}\n\n{body}"
+        )
+    return package.joinpath("__init__.py")
+
+
+def measure(action: Callable[[], None], repeat: int, setup: Callable[[], None] = None):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) * 1000)
+    return dict(
+        runs=repeat,
+        min_ms=round(min(timings), 3),
+        median_ms=round(statistics.median(timings), 3),
+        mean_ms=round(statistics.fmean(timings), 3),
+    )
+
+
+def make_app(root: Path, project: Path):
+    container = punq.Container()
+    di.configure_di(container)
+    config_storage = container.resolve(ConfigStorage)
+    config_storage.filename = str(root.joinpath("config.json"))
+    if not Path(config_storage.filename).exists():
+        config_storage.save(False)
+        config_storage.flush()  # Saves are write-behind, file must exist before config is loaded
+    config = config_storage.config
+    config.reload_all = False
+    config.lazy_loading = False
+    config.add_project(project)
+    config_storage.save(False)
+    container.resolve(Application)  # Previews are registered only while application exists
+    return container.resolve(ModuleLoader), container.resolve(PreviewsStorage).previews
+
+
+def run(modules: int, previews: int, depth: int, repeat: int):
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        project = generate_project(root, modules, previews, depth)
+        loader, manager = make_app(root, project)
+        loader.setup()  # Initial load, also saves previews index
+        registered = len(manager.previews)
+        middle = root.joinpath("generated", f"module_{modules // 2}.py").resolve()
+        results = dict(
+            load_any=measure(lambda: loader.load_any(project), repeat, loader.unload_all),
+            reload_all=measure(lambda: loader.reload_all(project), repeat),
+            load_module_reload=measure(lambda: loader.load_module(middle, True), repeat),
+            remove_module=measure(lambda: manager.remove_module(middle), repeat,
+                                  lambda: loader.load_module(middle, True)),
+            shorten_preview_names=measure(lambda: shorten_preview_names(manager.previews), repeat),
+        )
+        apps = [(loader, manager)]
+
+        def start_app():
+            apps[-1][0].unload_all()
+            apps.append(make_app(root, project))
+
+        def open_project():
+            # Same as application startup: previews index is used, changed modules loaded in background
+            new_loader = apps[-1][0]
+            new_loader.setup()
+            while new_loader.has_pending:
+                new_loader.load_pending()
+
+        results.update(open_project=measure(open_project, repeat, start_app))
+        apps[-1][0].unload_all()
+    return dict(
+        version=PySimplePreview.__version__,
+        python=platform.python_version(),
+        platform=platform.platform(),
+        date=datetime.now().isoformat(timespec='seconds'),
+        project=dict(modules=modules, previews_per_module=previews, import_depth=depth,
+                     previews_registered=registered),
+        results=results,
+    )
+
+
+def report(report_data: dict, baseline: dict = None):
+    project = report_data['project']
+    print(f"PySimplePreview {report_data['version']}, Python {report_data['python']}: "
+          f"{project['modules']} modules x {project['previews_per_module']} previews, "
+          f"import depth {project['import_depth']}")
+    baseline_results = (baseline or {}).get('results', {})
+    for name, result in report_data['results'].items():
+        line = f"{name:<22} median {result['median_ms']:10.2f} ms  min {result['min_ms']:10.2f} ms"
+        if name in baseline_results:
+            ratio = result['median_ms'] / max(baseline_results[name]['median_ms'], 1e-6)
+            line += f"  {ratio:6.2f}x of {baseline['version']}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reload pipeline benchmark")
+    parser.add_argument('-m', '--modules', type=int, default=200)
+    parser.add_argument('-p', '--previews', type=int, default=10, help="Previews per module")
+    parser.add_argument('-d', '--depth', type=int, default=5, help="Length of import chains")
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('-o', '--output', type=Path, help="Save results to JSON file")
+    parser.add_argument('-c', '--compare', type=Path, help="Results of previous run to compare with")
+    args = parser.parse_args()
+    sys.dont_write_bytecode = True
+    logging.disable(logging.WARNING)
+    report_data = run(args.modules, args.previews, max(1, args.depth), args.repeat)
+    baseline = json.loads(args.compare.read_text(encoding='utf-8')) if args.compare else None
+    report(report_data, baseline)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report_data, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
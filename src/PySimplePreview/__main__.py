@@ -1,15 +1,55 @@
+import sys
+from pathlib import Path
+
 import punq
 
 from PySimplePreview import di
+from PySimplePreview.domain.interactor.fork_server import ForkServer
+from PySimplePreview.domain.model.tracing import Tracer
 from PySimplePreview.view.app import Application
+from PySimplePreview.view.checker import PreviewsChecker, CheckOptions
+from PySimplePreview.view.controller.system_args_handler import make_parser
 
 
-def main():
+def run():
     container = punq.Container()
     di.configure_di(container)
     app: Application = container.resolve(Application)
     app.run()
 
 
+def check(options: CheckOptions):
+    container = punq.Container()
+    di.configure_di(container)
+    app: Application = container.resolve(Application)
+    app.handle_args()
+    checker = container.resolve(PreviewsChecker)
+    checker.options = options
+    try:
+        code = checker.run()
+    finally:
+        container.resolve(Tracer).close()
+    sys.exit(code)
+
+
+def main():
+    args, _ = make_parser().parse_known_args()
+    if args.check or args.export or args.baseline:
+        return check(CheckOptions(
+            group=args.group,
+            screenshots_dir=Path(args.export) if args.export else None,
+            workers=args.workers,
+            baseline_dir=Path(args.baseline) if args.baseline else None,
+            tolerance=args.tolerance,
+            update_baseline=args.update_baseline,
+        ))
+    if not args.fork_server:
+        return run()
+    if not ForkServer.is_supported():
+        print("Fork server isn't supported on this platform, running as usual")
+        return run()
+    ForkServer().serve(run)
+
+
 if __name__ == '__main__':
     main()
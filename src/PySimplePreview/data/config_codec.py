@@ -0,0 +1,164 @@
+import dataclasses
+import enum
+import json
+import types
+import typing
+from pathlib import PurePath
+
+from PySimplePreview.domain.model.config import Config
+
+T = typing.TypeVar('T')
+_ENCODER = typing.Callable[[typing.Any], typing.Any]
+_DECODER = typing.Callable[[typing.Any], typing.Any]
+
+
+class ConfigDecodeError(ValueError):
+    pass
+
+
+class DataclassCodec(typing.Generic[T]):
+    """
+    | Converter between dataclass and json compatible objects, same format as `jsons` produces
+    | (fields sorted by name, None values stripped, paths in posix style, enums by name, tuples as lists)
+    | Field converters are made once from type hints, so there is no reflection per call
+    """
+
+    def __init__(self, cls: type[T]):
+        self.cls = cls
+        hints = typing.get_type_hints(cls)
+        fields = [field for field in dataclasses.fields(cls) if field.init]
+        self._encoders = tuple((field.name, _make_encoder(hints[field.name]))
+                               for field in sorted(fields, key=lambda field: field.name))
+        self._decoders = tuple((field.name, _make_decoder(hints[field.name])) for field in fields)
+
+    def encode(self, obj: T) -> dict:
+        result = dict()
+        for name, encode in self._encoders:
+            value = getattr(obj, name)
+            if value is not None:
+                result[name] = encode(value)
+        return result
+
+    def decode(self, data: dict) -> T:
+        if not isinstance(data, dict):
+            raise ConfigDecodeError(f"Object expected for '{self.cls.__name__}', got {data!r}")
+        kwargs = dict()
+        for name, decode in self._decoders:
+            if name not in data:
+                continue
+            value = data[name]
+            try:
+                kwargs[name] = None if value is None else decode(value)
+            except ConfigDecodeError as e:
+                raise ConfigDecodeError(f"{self.cls.__name__}.{name}: {e}") from None
+            except (TypeError, ValueError, KeyError, AttributeError) as e:
+                raise ConfigDecodeError(f"{self.cls.__name__}.{name}: can't decode {value!r} ({e})") from None
+        return self.cls(**kwargs)
+
+
+_codecs: dict[type, DataclassCodec] = dict()
+
+
+def get_codec(cls: type[T]) -> DataclassCodec[T]:
+    codec = _codecs.get(cls)
+    if codec is None:
+        codec = _codecs[cls] = DataclassCodec(cls)
+    return codec
+
+
+def _unwrap_optional(hint):
+    if typing.get_origin(hint) in (typing.Union, types.UnionType):
+        args = tuple(arg for arg in typing.get_args(hint) if arg is not type(None))
+        if len(args) == 1:
+            return args[0]
+    return hint
+
+
+def _make_encoder(hint) -> _ENCODER:
+    hint = _unwrap_optional(hint)
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+    if hint in (bool, int, float, str):
+        return _same
+    if isinstance(hint, type) and issubclass(hint, PurePath):
+        return PurePath.as_posix
+    if isinstance(hint, type) and issubclass(hint, enum.Enum):
+        return _enum_name
+    if dataclasses.is_dataclass(hint):
+        return get_codec(hint).encode
+    if origin in (tuple, list):
+        if origin is tuple and (len(args) != 2 or args[-1] is not Ellipsis):
+            encoders = tuple(map(_make_encoder, args))
+            return lambda value: [encode(item) for encode, item in zip(encoders, value)]
+        encode_item = _make_encoder(args[0])
+        return lambda value: [encode_item(item) for item in value]
+    if origin is dict:
+        encode_value = _make_encoder(args[1])
+        return lambda value: {key: encode_value(item) for key, item in value.items() if item is not None}
+    raise TypeError(f"Can't make encoder for {hint}")
+
+
+def _make_decoder(hint) -> _DECODER:
+    hint = _unwrap_optional(hint)
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+    if hint is bool:
+        return _decode_bool
+    if hint in (int, float, str):
+        return hint
+    if isinstance(hint, type) and issubclass(hint, PurePath):
+        return hint
+    if isinstance(hint, type) and issubclass(hint, enum.Enum):
+        return hint.__getitem__
+    if dataclasses.is_dataclass(hint):
+        return get_codec(hint).decode
+    if origin in (tuple, list):
+        if origin is tuple and (len(args) != 2 or args[-1] is not Ellipsis):
+            decoders = tuple(map(_make_decoder, args))
+
+            def decode_fixed(value):
+                if len(value) != len(decoders):
+                    raise ConfigDecodeError(f"{len(decoders)} items expected, got {value!r}")
+                return tuple(decode(item) for decode, item in zip(decoders, value))
+            return decode_fixed
+        decode_item = _make_decoder(args[0])
+        return lambda value: origin(decode_item(item) for item in _as_list(value))
+    if origin is dict:
+        decode_value = _make_decoder(args[1])
+        return lambda value: {str(key): decode_value(item) for key, item in value.items()}
+    raise TypeError(f"Can't make decoder for {hint}")
+
+
+def _same(value):
+    return value
+
+
+def _enum_name(value: enum.Enum):
+    return value.name
+
+
+def _decode_bool(value):
+    if not isinstance(value, bool):
+        raise ConfigDecodeError(f"Boolean expected, got {value!r}")
+    return value
+
+
+def _as_list(value):
+    if not isinstance(value, list):
+        raise ConfigDecodeError(f"List expected, got {value!r}")
+    return value
+
+
+def dumps_config(config: Config) -> str:
+    return json.dumps(get_codec(Config).encode(config), indent=2)
+
+
+def loads_config(text: str) -> Config:
+    """
+    :raises ConfigDecodeError: Malformed config (also for invalid json)
+    """
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ConfigDecodeError(f"Invalid json: {e}") from None
+    return get_codec(Config).decode(data)
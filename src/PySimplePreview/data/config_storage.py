@@ -1,32 +1,74 @@
 import logging
 from copy import deepcopy
-from typing import Callable
+from pathlib import Path
+from typing import Callable, Iterable
 
-import jsons
-
-from PySimplePreview.domain.model.config import Config
+from PySimplePreview.data.config_codec import dumps_config, loads_config, ConfigDecodeError
+from PySimplePreview.data.positions_storage import PositionsStorage
+from PySimplePreview.data.write_behind import WriteBehind, write_atomic
+from PySimplePreview.domain.model.config import Config, ConfigChange
 from PySimplePreview.domain.model.event import InvokableEvent
+from PySimplePreview.domain.model.position import Position
 
 
 class ConfigStorage:
-    def __init__(self, filename: str = 'config.json'):
+    """
+    | Config, persisted as json file
+    | With non-zero **write_delay** (seconds) saves are write-behind: config serialized on saving thread,
+    | and written once per delay on background timer, use :meth:`flush` to write pending changes
+    | Window positions are stored separately (see :class:`PositionsStorage`), and written with config
+    | Listeners of **on_update** receive names of fields changed since previous save
+    """
+    POSITIONS_FILENAME = 'positions.jsonl'
+
+    def __init__(self, filename: str = 'config.json', write_delay: float = 0.5):
         self._config = None
         self.filename = filename
-        self._on_update = InvokableEvent[Callable[[Config], None]]()
+        self._on_update = InvokableEvent[Callable[[Config, ConfigChange], None]]()
+        self._saved_config: Config | None = None
         self.on_update = self._on_update.base
-        self._positions = None
+        self._positions: dict[str, Position] | None = None
+        self._positions_storage: PositionsStorage | None = None
+        self._pending_content: str | None = None
+        self._written_content: str | None = None
+        self._writer = WriteBehind(self._write, write_delay)
 
     @property
-    def positions(self):
+    def positions(self) -> PositionsStorage | dict[str, Position]:
         if self.config.remember_positions:
-            return self.config.positions
+            return self.positions_storage
         if not self._positions:
-            self._positions = deepcopy(self.config.positions)
+            self._positions = dict(self.positions_storage.items())
         return self._positions
 
     def dump_positions(self):
         if self._positions:
-            self.config.positions = self._positions
+            self.positions_storage.update(self._positions.items())
+
+    def remove_positions(self, keys: Iterable[str]):
+        keys = tuple(keys)
+        if self._positions:
+            for key in keys:
+                self._positions.pop(key, None)
+        self.positions_storage.remove(keys)
+
+    @property
+    def positions_storage(self):
+        if self._positions_storage is None:
+            self._positions_storage = PositionsStorage(
+                str(Path(self.filename).with_name(self.POSITIONS_FILENAME)),
+                on_change=self._writer.schedule,
+            )
+            self._migrate_positions()
+        return self._positions_storage
+
+    def _migrate_positions(self):
+        # Positions were stored in config file by previous versions
+        if not self.config.positions:
+            return
+        self._positions_storage.update(self.config.positions.items())
+        self.config.positions = dict()
+        self.save(False)
 
     @property
     def config(self) -> Config:
@@ -38,17 +80,42 @@ class ConfigStorage:
         try:
             self._config = Config()
             with open(self.filename, 'r', encoding='utf-8-sig') as file:
-                self._config = jsons.loads(file.read(), Config)
-        except (OSError, jsons.DeserializationError) as e:
+                self._config = loads_config(file.read())
+        except (OSError, ConfigDecodeError) as e:
             logging.exception(
                 "Load config failed, "
                 "file will be overwritten with latest loaded version...",
                 exc_info=e
             )
             self.save(False)
+        self._saved_config = deepcopy(self._config)
 
     def save(self, dispatch_changes=True):
-        with open(self.filename, 'w', encoding='utf-8-sig') as file:
-            file.write(jsons.dumps(self._config or Config(), strip_nulls=True, jdkwargs=dict(indent=2)))
-        if dispatch_changes:
-            self._on_update.invoke(self._config)
+        """
+        | Persist config and notify listeners about changed fields
+        | (changes saved without dispatch aren't reported later)
+        """
+        change = ConfigChange.of(self._saved_config, self._config or Config())
+        self._saved_config = deepcopy(self._config)
+        # Serialized here, as config is modified by UI thread, timer thread gets consistent snapshot
+        self._pending_content = dumps_config(self._config or Config())
+        self._writer.schedule()
+        if dispatch_changes and change:
+            self._on_update.invoke(self._config, change)
+
+    def flush(self):
+        """
+        | Write config and window positions to files now, if they have unsaved changes
+        """
+        self._writer.flush()
+
+    def _write(self):
+        content = self._pending_content
+        if content is not self._written_content:
+            try:
+                write_atomic(self.filename, content, 'utf-8-sig')
+                self._written_content = content
+            except OSError as e:
+                logging.warning(f"Config can't be saved: {e}")
+        if self._positions_storage is not None:
+            self._positions_storage.flush()
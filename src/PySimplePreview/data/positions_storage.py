@@ -0,0 +1,187 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Callable
+
+from PySimplePreview.data.config_codec import get_codec, ConfigDecodeError
+from PySimplePreview.data.write_behind import write_atomic
+from PySimplePreview.domain.model.position import Position
+
+
+class PositionsStorage:
+    """
+    | Window positions, stored as append-only log (json lines) next to config file
+    | Updates are buffered in memory and appended by :meth:`flush`, **on_change** is called to schedule it
+    | (config storage flushes positions with its write-behind timer), log is compacted once it's mostly outdated
+    | Positions of removed windows are dropped by :meth:`remove`, as backstop least recently used positions
+    | are dropped, when there is more than **capacity** of them
+    """
+    COMPACTION_THRESHOLD = 200  # Outdated lines tolerated before compaction
+
+    def __init__(self, filename: str, capacity: int = 1000, on_change: Callable[[], None] = None):
+        self.filename = filename
+        self.capacity = capacity
+        self._on_change = on_change
+        self._positions: OrderedDict[str, Position] = None
+        self._dirty: dict[str, Position] = dict()
+        self._removed = False  # Removed positions are still in log until it's compacted
+        self._log_size = 0
+        self._codec = get_codec(Position)
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def exists(self):
+        return Path(self.filename).exists()
+
+    def get(self, key: str, default: Position = None) -> Position | None:
+        with self._lock:
+            positions = self._loaded
+            position = positions.get(key)
+            if position is None:
+                return default
+            positions.move_to_end(key)
+            return position
+
+    def __setitem__(self, key: str, value: Position):
+        with self._lock:
+            positions = self._loaded
+            if positions.get(key) == value:
+                positions.move_to_end(key)
+                return
+            self._set(key, value)
+            self._prune()
+        self._notify()
+
+    def update(self, items: Iterable[tuple[str, Position]]):
+        with self._lock:
+            if self._positions is None:
+                self.load()
+            for key, value in items:
+                self._set(key, value)
+            self._prune()
+        self._notify()
+
+    def remove(self, keys: Iterable[str]):
+        """
+        | Forget positions of **keys**, log is compacted by next flush
+        """
+        with self._lock:
+            positions = self._loaded
+            removed = False
+            for key in keys:
+                if positions.pop(key, None) is not None:
+                    self._dirty.pop(key, None)
+                    removed = True
+            self._removed |= removed
+        if removed:
+            self._notify()
+
+    def items(self):
+        with self._lock:
+            return tuple(self._loaded.items())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._loaded)
+
+    @property
+    def _loaded(self):
+        if self._positions is None:
+            self.load()
+        return self._positions
+
+    def load(self):
+        with self._lock:
+            self._positions = OrderedDict()
+            self._dirty.clear()
+            self._removed = False
+            self._log_size = 0
+            try:
+                with open(self.filename, 'r', encoding='utf-8') as file:
+                    for line in file:
+                        self._log_size += 1
+                        try:
+                            record = json.loads(line)
+                            key = record.pop('key')
+                            self._positions[key] = self._codec.decode(record)
+                            self._positions.move_to_end(key)
+                        except (ValueError, KeyError, TypeError, AttributeError, ConfigDecodeError):
+                            continue  # Line may be partially written on crash
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"Window positions can't be loaded: {e}")
+            self._prune()  # Outdated log is compacted by next flush
+
+    def flush(self):
+        """
+        | Append buffered updates to log, or rewrite it with latest positions only, when it's mostly outdated
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._positions is None:
+                    return
+                items = tuple(self._dirty.items())
+                self._dirty.clear()
+                compact = self._removed or self._is_outdated(len(items))
+                if not items and not compact:
+                    return
+                self._removed = False
+                content = self._encode_all(self._positions.items() if compact else items)
+                size = len(self._positions)
+            if compact:
+                self._rewrite(content, size)
+            else:
+                self._append(content, len(items))
+
+    def compact(self):
+        """
+        | Rewrite log with latest positions only (in least recently used order)
+        """
+        with self._write_lock:
+            with self._lock:
+                self._dirty.clear()
+                self._removed = False
+                content = self._encode_all(self._loaded.items())
+                size = len(self._positions)
+            self._rewrite(content, size)
+
+    def _set(self, key: str, value: Position):
+        self._positions[key] = value
+        self._positions.move_to_end(key)
+        self._dirty[key] = value
+
+    def _notify(self):
+        # Called without lock held, as callback may wait for flush, which takes it
+        if self._on_change:
+            self._on_change()
+
+    def _append(self, content: str, count: int):
+        try:
+            with open(self.filename, 'a', encoding='utf-8') as file:
+                file.write(content)
+            self._log_size += count
+        except OSError as e:
+            logging.warning(f"Window position can't be saved: {e}")
+
+    def _rewrite(self, content: str, count: int):
+        try:
+            write_atomic(self.filename, content)
+            self._log_size = count
+        except OSError as e:
+            logging.warning(f"Window positions can't be compacted: {e}")
+
+    def _encode_all(self, items: Iterable[tuple[str, Position]]):
+        return "".join(json.dumps(dict(key=key, **self._codec.encode(value))) + "\n" for key, value in items)
+
+    def _prune(self):
+        while len(self._positions) > self.capacity:
+            key, _ = self._positions.popitem(last=False)
+            self._dirty.pop(key, None)
+
+    def _is_outdated(self, appended: int):
+        size = len(self._positions)
+        return self._log_size + appended - size > max(self.COMPACTION_THRESHOLD, size)
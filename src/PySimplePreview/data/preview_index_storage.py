@@ -0,0 +1,90 @@
+import json
+import logging
+from pathlib import Path
+
+from PySimplePreview.data.config_codec import get_codec, ConfigDecodeError
+from PySimplePreview.data.config_storage import ConfigStorage
+from PySimplePreview.data.write_behind import WriteBehind, write_atomic
+from PySimplePreview.domain.model.preview_index import ProjectIndex, ModuleIndex
+
+
+class PreviewIndexStorage:
+    """
+    | Previews found in each project module during previous sessions,
+    | stored next to config file
+    | Saves are write-behind: only changed modules are encoded on saving thread,
+    | file is written once per **write_delay** (seconds) on background timer, use :meth:`flush` to write it now
+    """
+
+    def __init__(self, config: ConfigStorage, filename: str = 'previews_index.json', write_delay: float = 1.0):
+        self._config_storage = config
+        self.filename = str(Path(config.filename).with_name(filename))
+        self._indexes: dict[str, ProjectIndex] = None
+        # Json compatible copy of indexes, replaced instead of modified, so timer thread can write it any time
+        self._encoded: dict[str, dict] = dict()
+        self._module_codec = get_codec(ModuleIndex)
+        self._writer = WriteBehind(self._write, write_delay)
+
+    def get(self, project: Path) -> ProjectIndex | None:
+        if self._indexes is None:
+            self.load()
+        return self._indexes.get(self._key_of(project))
+
+    def update(self, project: Path, modules: dict[str, ModuleIndex | None], replace=False):
+        """
+        | Update entries of **modules** (relative posix paths) in project index, None entry removes module
+        | With **replace** project index consists of given modules only
+        """
+        if self._indexes is None:
+            self.load()
+        key = self._key_of(project)
+        index = None if replace else self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = ProjectIndex()
+        encoded_modules = dict() if replace else dict(self._encoded.get(key, {}).get('modules', {}))
+        for name, entry in modules.items():
+            if entry is None:
+                index.modules.pop(name, None)
+                encoded_modules.pop(name, None)
+            else:
+                index.modules[name] = entry
+                encoded_modules[name] = self._module_codec.encode(entry)
+        self._encoded = {**self._encoded, key: dict(modules=encoded_modules)}
+        self.save()
+
+    def load(self):
+        self._indexes = dict()
+        self._encoded = dict()
+        try:
+            with open(self.filename, 'r', encoding='utf-8-sig') as file:
+                encoded = json.loads(file.read())
+            if not isinstance(encoded, dict):
+                raise ConfigDecodeError(f"Object expected, got {encoded!r}")
+            codec = get_codec(ProjectIndex)
+            self._indexes = {key: codec.decode(index) for key, index in encoded.items()}
+            self._encoded = encoded
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"Previews index can't be loaded, it'll be rebuilt: {e}")
+
+    def save(self):
+        self._writer.schedule()
+
+    def flush(self):
+        """
+        | Write index to file now, if it has unsaved changes
+        """
+        self._writer.flush()
+
+    def _write(self):
+        projects = {self._key_of(project) for project in self._config_storage.config.projects}
+        indexes = {key: index for key, index in self._encoded.items() if key in projects}
+        try:
+            write_atomic(self.filename, json.dumps(indexes), 'utf-8-sig')
+        except OSError as e:
+            logging.warning(f"Previews index can't be saved: {e}")
+
+    @staticmethod
+    def _key_of(project: Path):
+        return str(Path(project).resolve())
@@ -0,0 +1,64 @@
+import atexit
+import os
+import threading
+from typing import Callable
+
+
+def write_atomic(filename: str, content: str, encoding: str = 'utf-8'):
+    """
+    | Write file through temporary one renamed over it,
+    | so crash or other process writing at once can't leave it partially written
+
+    :raises OSError: File can't be written
+    """
+    temp_filename = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_filename, 'w', encoding=encoding) as file:
+            file.write(content)
+        os.replace(temp_filename, filename)
+    except OSError:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
+class WriteBehind:
+    """
+    | Calls **write** on background timer **delay** seconds after :meth:`schedule`,
+    | schedules made meanwhile result in single write, zero **delay** writes synchronously
+    | **write** must take data snapshot made by scheduling thread, as it's called on timer thread
+    | Pending write is done by :meth:`flush`, also called at exit
+    """
+
+    def __init__(self, write: Callable[[], None], delay: float):
+        self.delay = delay
+        self._write = write
+        self._pending = False
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def schedule(self):
+        with self._lock:
+            self._pending = True
+            if self.delay and not self._timer:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if not self.delay:
+            self.flush()
+
+    def flush(self):
+        """
+        | Write now, if there is pending write
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._timer:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending:
+                    return
+                self._pending = False  # Schedules made during write cause one more write
+            self._write()
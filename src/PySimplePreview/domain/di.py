@@ -2,12 +2,22 @@ import punq
 
 from PySimplePreview.domain.interactor.abc.files_observer import ProjectObserver
 from PySimplePreview.domain.interactor.abc.module_loader import ModuleLoader
+from PySimplePreview.domain.interactor.code_cache import CodeCache
 from PySimplePreview.domain.interactor.files_observer import ProjectObserverImpl
 from PySimplePreview.domain.interactor.module_loader import ModuleLoaderImpl
+from PySimplePreview.domain.interactor.preview_index_updater import PreviewIndexUpdater
 from PySimplePreview.domain.interactor.previews_manager import PreviewsManager
+from PySimplePreview.domain.model.source_index import SourceIndex
+from PySimplePreview.domain.model.tracing import Tracer
+from PySimplePreview.domain.model.wakeup import Wakeup
 
 
 def register_domain(container: punq.Container):
     container.register(ModuleLoader, ModuleLoaderImpl, scope=punq.Scope.singleton)
     container.register(PreviewsManager, scope=punq.Scope.singleton)
+    container.register(PreviewIndexUpdater, scope=punq.Scope.singleton)
     container.register(ProjectObserver, ProjectObserverImpl, scope=punq.Scope.singleton)
+    container.register(Wakeup, scope=punq.Scope.singleton)
+    container.register(SourceIndex, scope=punq.Scope.singleton)
+    container.register(CodeCache, scope=punq.Scope.singleton)
+    container.register(Tracer, scope=punq.Scope.singleton)
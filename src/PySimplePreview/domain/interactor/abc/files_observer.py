@@ -7,7 +7,7 @@ from PySimplePreview.domain.model.event import Event
 
 class ProjectObserver(metaclass=ABCMeta):
     def __init__(self):
-        self.on_project_update = Event[typing.Callable[[Path, bool], None]]()
+        self.on_project_update = Event[typing.Callable[[tuple[Path, ...], bool], None]]()
 
     @abstractmethod
     def close(self):
@@ -24,3 +24,8 @@ class ProjectObserver(metaclass=ABCMeta):
     @abstractmethod
     def dispatch_events(self):
         pass
+
+    @property
+    @abstractmethod
+    def dispatch_delay(self) -> int | None:
+        pass
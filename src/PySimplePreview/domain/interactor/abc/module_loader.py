@@ -4,6 +4,7 @@ from abc import ABCMeta, abstractmethod
 from pathlib import Path
 
 from PySimplePreview.domain.model.event import Event
+from PySimplePreview.domain.model.preview import PreviewInfo
 
 
 class ModuleLoader(metaclass=ABCMeta):
@@ -12,6 +13,8 @@ class ModuleLoader(metaclass=ABCMeta):
         ModuleUnloaded = enum.auto()
         PackageReloadStarted = enum.auto()
         PackageReloadEnded = enum.auto()
+        PackageUnloaded = enum.auto()
+        ModuleDeferred = enum.auto()
 
     def __init__(self):
         self.on_event = Event[typing.Callable[[ModuleLoader.EventType, Path], None]]()
@@ -39,3 +42,32 @@ class ModuleLoader(metaclass=ABCMeta):
     @abstractmethod
     def load_module(self, path, reload):
         pass
+
+    @abstractmethod
+    def get_deferred_previews(self, path) -> tuple[PreviewInfo, ...]:
+        pass
+
+    @abstractmethod
+    def get_dependencies(self, path) -> frozenset[Path]:
+        """
+        | Project modules loaded module at **path** imports, directly or transitively
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def timed_out(self) -> dict[Path, str]:
+        """
+        | Modules, which import exceeded its budget, with digest of their source,
+        | they aren't imported again until source changed
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def has_pending(self) -> bool:
+        pass
+
+    @abstractmethod
+    def load_pending(self) -> bool:
+        pass
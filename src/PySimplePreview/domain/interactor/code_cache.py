@@ -0,0 +1,156 @@
+import dis
+import importlib.machinery
+import marshal
+import multiprocessing
+import os
+import types
+import typing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from PySimplePreview.domain.model.source_index import SourceStamp
+
+IMPORT: typing.TypeAlias = tuple[int, str, tuple[str, ...]]
+_IMPORT_NAME = dis.opmap['IMPORT_NAME']
+
+
+@dataclass
+class CompiledSource:
+    stamp: SourceStamp
+    code: types.CodeType
+    _imports: tuple[IMPORT, ...] = field(default=None, repr=False)
+
+    @property
+    def imports(self) -> tuple[IMPORT, ...]:
+        """
+        | Import statements found in code as (level, module name, fromlist) tuples
+        | Extracted from bytecode, so no source parsing required
+        """
+        if self._imports is None:
+            self._imports = tuple(_find_imports(self.code))
+        return self._imports
+
+
+class CodeCache:
+    PARALLEL_COMPILE_THRESHOLD = 400  # Uncached modules, see benchmarks/precompile.py
+
+    def __init__(self):
+        self._entries: dict[Path, CompiledSource] = dict()
+
+    def get(self, path: Path, source: bytes):
+        stamp = SourceStamp.of(path, source)
+        entry = self._entries.get(path)
+        if entry and entry.stamp.digest == stamp.digest:
+            entry.stamp = stamp
+            return entry
+        return None
+
+    def put(self, path: Path, stamp: SourceStamp, code: types.CodeType):
+        entry = CompiledSource(stamp, code)
+        self._entries[path] = entry
+        return entry
+
+    def peek(self, path: Path):
+        return self._entries.get(path)
+
+    def precompile(self, paths: typing.Sequence[Path], workers: int = None) -> dict[Path, Exception]:
+        """
+        | Read and compile all **paths** not cached yet, without executing anything
+        | Sources read in threads, compiled in pool of **workers** processes (CPU count by default)
+        | only if there are many of them: each worker takes ~0.4 s to start (it imports this package)
+
+        :return: Compilation errors found, by module path
+        """
+        with ThreadPoolExecutor() as pool:
+            sources = dict(zip(paths, pool.map(_read_source, paths)))
+        missing = [(path, source) for path, source in sources.items()
+                   if source is not None and self.get(path, source) is None]
+        workers = min(len(missing), workers or os.cpu_count() or 1)
+        if workers > 1 and len(missing) >= self.PARALLEL_COMPILE_THRESHOLD:
+            # Spawned workers don't inherit tkinter state from this process
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(workers, mp_context=context) as pool:
+                results = pool.map(
+                    _compile_to_bytes,
+                    *zip(*((str(path), source) for path, source in missing)),
+                    chunksize=max(1, len(missing) // (workers * 4)),
+                )
+                results = [
+                    marshal.loads(result) if isinstance(result, bytes) else result
+                    for result in results
+                ]
+        else:
+            results = [_compile(str(path), source) for path, source in missing]
+        errors = dict()
+        for (path, source), result in zip(missing, results):
+            if isinstance(result, Exception):
+                errors[path] = result
+            else:
+                self.put(path, SourceStamp.of(path, source), result)
+        return errors
+
+    def forget(self, path: Path):
+        self._entries.pop(path, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CachedSourceFileLoader(importlib.machinery.SourceFileLoader):
+    """
+    | Source loader, which skips parse/compile for module sources already seen by **cache**
+    | On cache miss regular loader used (with `__pycache__` on-disk bytecode cache)
+    """
+
+    def __init__(self, fullname: str, path: str, cache: CodeCache):
+        super().__init__(fullname, path)
+        self._cache = cache
+        self.compiled: CompiledSource | None = None
+
+    def get_code(self, fullname):
+        path = Path(self.path)
+        source = self.get_data(self.path)
+        self.compiled = self._cache.get(path, source)
+        if self.compiled is None:
+            stamp = SourceStamp.of(path, source)
+            self.compiled = self._cache.put(path, stamp, super().get_code(fullname))
+        return self.compiled.code
+
+
+def _read_source(path: Path):
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _compile(path: str, source: bytes):
+    try:
+        return compile(source, path, 'exec', dont_inherit=True)
+    except (SyntaxError, ValueError) as e:
+        return e
+
+
+def _compile_to_bytes(path: str, source: bytes):
+    result = _compile(path, source)
+    return result if isinstance(result, Exception) else marshal.dumps(result)
+
+
+def _find_imports(code: types.CodeType):
+    # Wordcode: opcodes are at even offsets, cheap check allows to skip disassembling
+    instructions = tuple(dis.get_instructions(code)) if _IMPORT_NAME in code.co_code[::2] else ()
+    for i, instruction in enumerate(instructions):
+        if instruction.opname == 'IMPORT_NAME' and i >= 2:
+            level, fromlist = instructions[i - 2].argval, instructions[i - 1].argval
+            yield (
+                level if isinstance(level, int) else 0,
+                instruction.argval,
+                fromlist if isinstance(fromlist, tuple) else tuple(),
+            )
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _find_imports(const)
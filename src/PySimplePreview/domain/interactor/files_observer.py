@@ -3,19 +3,25 @@ import logging
 import time
 from pathlib import Path
 from queue import Queue
+from typing import Callable
 
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
 from PySimplePreview.data.config_storage import ConfigStorage
 from PySimplePreview.domain.interactor.abc.files_observer import ProjectObserver
-from PySimplePreview.domain.model.config import Config, is_package_project
+from PySimplePreview.domain.model.config import Config, is_package_project, ConfigChange
 from PySimplePreview.domain.model.event import InvokableEvent
+from PySimplePreview.domain.model.source_index import SourceIndex
+from PySimplePreview.domain.model.tracing import Tracer
+from PySimplePreview.domain.model.wakeup import Wakeup
 
 
 class FilesObserver(FileSystemEventHandler):
-    def __init__(self, root_path: str):
+    def __init__(self, root_path: str, tracer: Tracer, on_change: Callable[[], None] = None):
         self.last_event = 0
+        self.tracer = tracer
+        self.on_change = on_change
         self.events = {}
         self.cooldown = 50
         self.queue = Queue()
@@ -41,12 +47,32 @@ class FilesObserver(FileSystemEventHandler):
                 return
         self.events[event.src_path] = timestamp
         super().on_modified(event)
+        self.last_event = timestamp
+        self.tracer.mark("file_changed")
         self.queue.put_nowait(event.src_path)
+        if self.on_change:
+            self.on_change()
+
+    def time_to_dispatch(self, quiet_window: int) -> int | None:
+        if self.queue.empty():
+            return None
+        return max(0, self.last_event + quiet_window - int(time.time() * 1000))
+
+    def pop_changes(self, quiet_window: int) -> tuple[str, ...]:
+        if self.time_to_dispatch(quiet_window) != 0:
+            return tuple()
+        changes = dict()
+        while not self.queue.empty():
+            changes[self.queue.get_nowait()] = None
+        return tuple(changes)
 
 
 class ProjectObserverImpl(ProjectObserver):
-    def __init__(self, config: ConfigStorage):
+    def __init__(self, config: ConfigStorage, wakeup: Wakeup, sources: SourceIndex, tracer: Tracer):
         super().__init__()
+        self._wakeup = wakeup
+        self._tracer = tracer
+        self._sources = sources
         self.on_project_update = InvokableEvent.from_base(self.on_project_update)
         self._observer: FilesObserver = None
         self._config_storage = config
@@ -54,19 +80,14 @@ class ProjectObserverImpl(ProjectObserver):
         self._is_package = False
         self._config_storage.on_update += self._on_update
 
-    def _callback(self, path: str):
-        if self._is_package or self._last_project.samefile(path):
-            self.on_project_update.invoke(Path(path), False)
+    def _is_tracked(self, path: str):
+        return self._is_package or self._last_project.samefile(path)
 
     def close(self):
         if self._observer:
             self._observer.stop()
             self._observer = None
 
-    def _single_module_track(self, path: str):
-        if self._last_project.samefile(path):
-            self._callback(path)
-
     def start(self):
         if not self._last_project:
             return
@@ -74,26 +95,41 @@ class ProjectObserverImpl(ProjectObserver):
         self._is_package = is_package
         if not self._observer:
             self._observer = FilesObserver(
-                str(self._last_project.parent if self._last_project.is_file() else self._last_project)
+                str(self._last_project.parent if self._last_project.is_file() else self._last_project),
+                self._tracer,
+                self._wakeup.notify,
             )
         self._observer.start()
         project_name = self._last_project.parent.name if is_package else self._last_project.stem
         logging.info("Start watching " + ("package" if is_package else "single module")
                      + f" '{project_name}'...")
 
-    def _on_update(self, config: Config):
+    def _on_update(self, config: Config, change: ConfigChange = None):
+        if change is not None and not change.any("current_project"):
+            return
         if config.current_project and self._last_project != config.current_project:
             self._last_project = config.current_project
             self.close()
-            self.on_project_update.invoke(config.current_project, True)
+            self.on_project_update.invoke((config.current_project,), True)
             self.start()
 
     def dispatch_events(self):
         if not self._observer:
             return
-        while not self._observer.queue.empty():
-            data = self._observer.queue.get_nowait()
-            self._callback(data)
+        changes = self._observer.pop_changes(self._config_storage.config.reload_quiet_window)
+        changes = tuple(Path(path) for path in changes if self._is_tracked(path))
+        changes = tuple(path for path in changes if self._sources.is_changed(path))
+        if changes:
+            start = self._tracer.record_since("file_changed", "observer.dispatch", files=len(changes))
+            if start is not None:
+                self._tracer.mark("reload", start)
+            self.on_project_update.invoke(changes, False)
+
+    @property
+    def dispatch_delay(self):
+        if not self._observer:
+            return None
+        return self._observer.time_to_dispatch(self._config_storage.config.reload_quiet_window)
 
     @contextlib.contextmanager
     def track(self):
@@ -0,0 +1,136 @@
+import importlib
+import logging
+import os
+import select
+import signal
+import sys
+import traceback
+import typing
+from contextlib import suppress
+
+
+class ForkServer:
+    """
+    | Keeps pre-warmed interpreter (PySimpleGUI, PySimplePreview and project's third-party modules imported)
+    | and forks fresh app process from it on every full reload, instead of starting new interpreter
+    """
+    RESTART_EXIT_CODE = 3
+    POLL_INTERVAL = 0.5  # Seconds between checks if child exited
+    _END = b"\0"
+    current: 'ForkServer' = None
+
+    def __init__(self):
+        self._channel: int = None
+
+    @staticmethod
+    def is_supported():
+        return hasattr(os, 'fork')
+
+    @property
+    def is_serving(self):
+        return self._channel is not None
+
+    def serve(self, target: typing.Callable[[], None]):
+        self.__class__.current = self
+        while True:
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                os.set_inheritable(write_fd, False)  # Processes spawned by app mustn't hold it
+                self._channel = write_fd
+                signal.signal(signal.SIGINT, signal.default_int_handler)
+                os._exit(self._run_child(target))
+            os.close(write_fd)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)  # Child handles Ctrl + C by itself
+            warm_modules, status = self._receive(read_fd, pid)
+            code = os.waitstatus_to_exitcode(status)
+            if code < 0:
+                print(f"PySimplePreview process killed by signal {-code}, restarting...", file=sys.stderr)
+            elif code != self.RESTART_EXIT_CODE:
+                sys.exit(code)
+            self._warm_up(warm_modules)
+
+    def _receive(self, read_fd: int, pid: int):
+        """
+        | Read modules to warm up, sent by child on restart, and wait for child exit
+        | Message is read until terminator or child exit, not until EOF,
+        | since processes forked by app (e.g. by user code) may keep pipe open
+        """
+        data = b""
+        status = None
+        while not data.endswith(self._END):
+            readable, _, _ = select.select([read_fd], [], [], self.POLL_INTERVAL)
+            if readable:
+                chunk = os.read(read_fd, 65536)
+                if not chunk:
+                    break
+                data += chunk
+                continue
+            exited, status = os.waitpid(pid, os.WNOHANG)
+            if exited:
+                data += self._read_available(read_fd)
+                break
+            status = None
+        os.close(read_fd)
+        if status is None:
+            _, status = os.waitpid(pid, 0)
+        return data.rstrip(self._END).decode('utf-8').split(), status
+
+    @staticmethod
+    def _read_available(fd: int):
+        os.set_blocking(fd, False)
+        data = b""
+        with suppress(BlockingIOError):
+            while chunk := os.read(fd, 65536):
+                data += chunk
+        return data
+
+    @staticmethod
+    def _run_child(target: typing.Callable[[], None]):
+        code = 0
+        try:
+            target()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            with suppress(Exception):
+                sys.stdout.flush()
+                sys.stderr.flush()
+        return code
+
+    @staticmethod
+    def _warm_up(modules: typing.Iterable[str]):
+        for name in modules:
+            if name in sys.modules:
+                continue
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                logging.warning(f"Module '{name}' can't be imported by fork server: {e}")
+
+    def restart(self, warm_modules: typing.Iterable[str] = (), immediately=False):
+        """
+        | Exit, so fork server starts app again
+        | With **immediately** process exits at once, without any cleanup, so it can be called from any thread
+        | (e.g. to kill main thread stuck in user code)
+        """
+        if not self.is_serving:
+            raise RuntimeError("Restart requested outside of fork server process")
+        logging.info("Restarting from fork server...")
+        with suppress(OSError):
+            message = "\n".join(warm_modules).encode('utf-8') + self._END
+            while message:
+                message = message[os.write(self._channel, message):]
+        with suppress(OSError):
+            os.close(self._channel)
+        self._channel = None
+        if immediately:
+            with suppress(Exception):
+                sys.stdout.flush()
+                sys.stderr.flush()
+            os._exit(self.RESTART_EXIT_CODE)
+        sys.exit(self.RESTART_EXIT_CODE)
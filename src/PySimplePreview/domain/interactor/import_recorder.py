@@ -0,0 +1,59 @@
+import contextlib
+import importlib.abc
+import sys
+import threading
+
+
+class ImportRecorder(importlib.abc.MetaPathFinder):
+    """
+    | Meta path finder, which never finds anything, but remembers names of all modules,
+    | python tried to import (i.e. not found in `sys.modules`)
+    | Imports made outside of **record** are collected as orphans
+    | Records are per thread, so imports of other threads aren't attributed to module recorded
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._orphans: set[str] = set()
+        self._orphans_lock = threading.Lock()
+
+    @property
+    def _records(self) -> list[set[str]]:
+        records = getattr(self._local, 'records', None)
+        if records is None:
+            records = self._local.records = []
+        return records
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        records = self._records
+        if records:
+            records[-1].add(fullname)
+        else:
+            with self._orphans_lock:
+                self._orphans.add(fullname)
+        return None
+
+    @contextlib.contextmanager
+    def record(self):
+        imported = set()
+        records = self._records
+        records.append(imported)
+        try:
+            yield imported
+        finally:
+            records.pop()
+            if records:
+                records[-1] |= imported
+
+    def pop_orphans(self):
+        with self._orphans_lock:
+            orphans, self._orphans = self._orphans, set()
+        return orphans
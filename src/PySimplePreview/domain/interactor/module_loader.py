@@ -1,26 +1,62 @@
+import contextlib
 import glob
 import importlib.util
 import inspect
 import logging
 import os
 import sys
+import typing
+from collections import deque
 from pathlib import Path
 
 from PySimplePreview.data.config_storage import ConfigStorage
+from PySimplePreview.data.preview_index_storage import PreviewIndexStorage
 from PySimplePreview.domain.interactor.abc.files_observer import ProjectObserver
 from PySimplePreview.domain.interactor.abc.module_loader import ModuleLoader
+from PySimplePreview.domain.interactor.code_cache import CodeCache, CachedSourceFileLoader, IMPORT
+from PySimplePreview.domain.interactor.fork_server import ForkServer
+from PySimplePreview.domain.interactor.import_recorder import ImportRecorder
+from PySimplePreview.domain.interactor.preview_indexer import scan_previews
+from PySimplePreview.domain.interactor.supervisor import run_supervised, ExecutionTimeout
 from PySimplePreview.domain.interactor.previews_manager import get_longest_module_name
-from PySimplePreview.domain.model.config import is_package_project, Config, get_package_root
+from PySimplePreview.domain.model.config import is_package_project, Config, get_package_root, ConfigChange
+from PySimplePreview.domain.model.dependency_graph import DependencyGraph
 from PySimplePreview.domain.model.event import InvokableEvent
+from PySimplePreview.domain.model.preview import PreviewInfo
+from PySimplePreview.domain.model.preview_index import ProjectIndex, ModuleIndex
+from PySimplePreview.domain.model.source_index import SourceIndex, SourceStamp
+from PySimplePreview.domain.model.tracing import Tracer
 
 
 class ModuleLoaderImpl(ModuleLoader):
-    def __init__(self, config: ConfigStorage, project_observer: ProjectObserver):
+    def __init__(
+        self,
+        config: ConfigStorage,
+        project_observer: ProjectObserver,
+        sources: SourceIndex,
+        code_cache: CodeCache,
+        index_storage: PreviewIndexStorage,
+        tracer: Tracer,
+    ):
         super().__init__()
+        self._sources = sources
+        self._tracer = tracer
+        self._code_cache = code_cache
+        self._index_storage = index_storage
         self.on_event = InvokableEvent.from_base(self.on_event)
         self._imported = dict()
         self._extra_imported = set()
         self._last_imported = None
+        self._dependencies = DependencyGraph()
+        self._aliases: dict[Path, set[str]] = dict()
+        self._import_recorder = ImportRecorder()
+        self._import_recorder.install()
+        self._root: Path = None
+        self._project: Path = None  # Package project, which index is used
+        self._timed_out: dict[Path, str] = dict()
+        self._deferred: dict[Path, tuple[PreviewInfo, ...]] = dict()
+        self._pending: deque[Path] = deque()
+        self._lazy_loading = config.config.lazy_loading
         self._config_storage = config
         self._config_storage.on_update += self._on_update
         project_observer.on_project_update += self._on_module_update
@@ -28,13 +64,18 @@ class ModuleLoaderImpl(ModuleLoader):
     def setup(self):
         self._on_update(self._config_storage.config)
 
-    def _on_update(self, config: Config):
-        if config.current_project and self._last_imported != config.current_project:
+    def _on_update(self, config: Config, change: ConfigChange = None):
+        if change is not None and not change.any("current_project", "lazy_loading"):
+            return
+        if not config.current_project:
+            return
+        if self._last_imported != config.current_project or self._lazy_loading != config.lazy_loading:
             self.reload_all(Path(config.current_project))
             self._last_imported = config.current_project
 
-    def _on_module_update(self, path: Path, is_project: bool):
-        if is_project and path and self._last_imported != path:
+    def _on_module_update(self, paths: tuple[Path, ...], is_project: bool):
+        path = paths[0] if is_project else None
+        if path and self._last_imported != path:
             self.reload_all(path)
             self._last_imported = path
             return
@@ -43,7 +84,25 @@ class ModuleLoaderImpl(ModuleLoader):
             if project:
                 self.reload_all(project)
         else:
-            self.load_module(path, True)
+            self.reload_modules(paths)
+
+    def reload_modules(self, paths: typing.Iterable[str | Path]):
+        paths = list(dict.fromkeys(Path(path).resolve() for path in paths))
+        with self._tracer.span("loader.reload_modules", changed=len(paths)):
+            self._reload_modules(paths)
+
+    def _reload_modules(self, paths: list[Path]):
+        affected = self._dependencies.affected_by(paths)
+        self.on_event.invoke(ModuleLoader.EventType.PackageReloadStarted, self._last_imported)
+        if len(affected) > len(paths):
+            logging.info(f"Reloading {len(paths)} changed module(s) "
+                         f"with {len(affected) - len(paths)} dependent module(s)")
+        for module_path in reversed(affected):
+            self.unload_module(module_path)
+        self._forget_aliases(set(affected))
+        for module_path in affected:
+            self.load_module(module_path, True)
+        self.on_event.invoke(ModuleLoader.EventType.PackageReloadEnded, self._last_imported)
 
     def load_any(self, path: str | Path):
         path = Path(path)
@@ -51,13 +110,36 @@ class ModuleLoaderImpl(ModuleLoader):
             root = get_package_root(path)
             if not root:
                 raise ValueError("No python package root found, can't import anything")
-            self.load_module(root)
             root_dir = root if root.is_dir() else root.parent
+            self._root = root_dir.resolve()
+            self._project = path
             mask = str(root_dir.joinpath("**", "*.py"))
-            for module in glob.iglob(mask, recursive=True):
-                if not root.samefile(module):
-                    self.load_module(module)
+            modules = [Path(module).resolve() for module in glob.iglob(mask, recursive=True)
+                       if not root.samefile(module)]
+            index = self._index_storage.get(path) if self._last_imported != path else None
+            if index is not None:
+                modules = self._defer_indexed(modules, index)
+            self._lazy_loading = self._config_storage.config.lazy_loading
+            if self._lazy_loading:
+                self.load_module(root)
+                self._defer_modules(modules)
+                return
+            errors = self._code_cache.precompile(modules + ([root.resolve()] if root.is_file() else []))
+            for module, error in errors.items():
+                logging.error(f"Module '{module.relative_to(self._root)}' can't be compiled: {error}")
+            self.load_module(root)
+            modules = self._order_by_imports([module for module in modules if module not in errors])
+            if index is not None:
+                # Previews of unchanged modules already shown, changed ones loaded in background
+                if modules:
+                    logging.info(f"{len(modules)} module(s) changed since last session, loading...")
+                self._pending.extend(modules)
+                return
+            for module in modules:
+                self.load_module(module)
         else:
+            self._root = path.resolve().parent
+            self._project = None
             self.load_module(path)
 
     def unload_all(self):
@@ -67,19 +149,51 @@ class ModuleLoaderImpl(ModuleLoader):
             if module in sys.modules:
                 del sys.modules[module]
         self._extra_imported.clear()
+        self._deferred.clear()
+        self._pending.clear()
+        self._dependencies.clear()
+        self._aliases.clear()
+        self._import_recorder.pop_orphans()
+        self._sources.clear()
         importlib.invalidate_caches()
+        self.on_event.invoke(ModuleLoader.EventType.PackageUnloaded, self._last_imported)
 
     def reload_all(self, path):
         self.on_event.invoke(ModuleLoader.EventType.PackageReloadStarted, path)
         if self._config_storage.config.reload_all and self._last_imported:
             self._hard_reload()
             return
-        self.unload_all()
-        self.load_any(path)
-        self.on_event.invoke(ModuleLoader.EventType.PackageReloadEnded, path)
+        with self._tracer.span("loader.reload_all"):
+            self.unload_all()
+            self.load_any(path)
+        if not self._pending:
+            self.on_event.invoke(ModuleLoader.EventType.PackageReloadEnded, path)
+
+    @property
+    def has_pending(self):
+        return bool(self._pending)
+
+    @property
+    def timed_out(self):
+        return dict(self._timed_out)
+
+    def load_pending(self):
+        """
+        | Load next module left by :meth:`load_any` for later
+        | Package reload considered ended when nothing left
+
+        :return: True, when last pending module loaded
+        """
+        if not self._pending:
+            return False
+        self.load_module(self._pending.popleft())
+        if self._pending:
+            return False
+        self.on_event.invoke(ModuleLoader.EventType.PackageReloadEnded, self._last_imported)
+        return True
 
     def load_module(self, path: str | Path, reload=False):
-        path = Path(path)
+        path = Path(path).resolve()
         is_package = path.is_dir() or is_package_project(path)
         if is_package_project(path):
             path = path.parent
@@ -88,12 +202,12 @@ class ModuleLoaderImpl(ModuleLoader):
         if not module_path.exists():
             logging.info(f"Package '{name}' resolved as flat (no __init__ found)")
             return
-        old_modules = set(sys.modules.keys())
         root_path = str(path if path.is_dir() else path.parent)
         if root_path not in sys.path:
             sys.path.append(root_path)
         spec = importlib.util.spec_from_file_location(
             name, module_path,
+            loader=CachedSourceFileLoader(name, str(module_path), self._code_cache),
             submodule_search_locations=[root_path]
         )
         if path in self._imported:
@@ -103,38 +217,226 @@ class ModuleLoaderImpl(ModuleLoader):
             else:
                 return
         module_naming = "package" if is_package else "module"
+        if self._is_timed_out(module_path):
+            logging.error(f"{module_naming.title()} '{name}' isn't imported: its import exceeded "
+                          f"import_timeout before, it'll be imported again once changed")
+            return
         logging.info(f"Loading {module_naming} '{name}'")
         module = importlib.util.module_from_spec(spec)
         if '.'.join(get_longest_module_name(module_path)) in self._extra_imported and not reload:
             logging.info(f"{module_naming.title()} '{name}' is already loaded, skipping...")
             self._imported[module_path] = spec.name
+            self._sources.update(module_path, SourceStamp.of(module_path))
             return
         sys.modules[spec.name] = module
         self._imported[module_path] = spec.name
+        self._deferred.pop(module_path, None)
         try:
-            spec.loader.exec_module(module)
-            new_modules = set(sys.modules.keys())
-            diff_modules = new_modules.difference(old_modules)
+            with self._tracer.span("loader.exec_module", module=spec.name), self._import_recorder.record() as imported:
+                # Module is executed on this (main) thread, which can't be interrupted safely,
+                # so stuck import is killed with whole app by fork server, if there is one
+                run_supervised(
+                    lambda: spec.loader.exec_module(module),
+                    self._config_storage.config.import_timeout,
+                    f"Import of {module_naming} '{name}'",
+                    lambda stack: self._on_import_timeout(module_path, spec.loader, stack),
+                )
+            compiled = spec.loader.compiled
+            diff_modules = {name for name in imported if name in sys.modules}
+            diff_modules.add(spec.name)
             self._extra_imported |= diff_modules
+            self._remember_aliases(diff_modules)
+            self._dependencies.set_dependencies(
+                module_path, self._find_project_dependencies(module, compiled.imports, diff_modules)
+            )
+            self._sources.update(module_path, compiled.stamp)
             self.on_event.invoke(ModuleLoader.EventType.ModuleLoaded, module_path)
         except Exception as e:
             logging.exception(
                 f"Can't import '{name}' {module_naming}",
                 exc_info=e
             )
+            if isinstance(e, ExecutionTimeout) and spec.loader.compiled:
+                self._timed_out[module_path] = spec.loader.compiled.stamp.digest.hex()
             self.unload_module(module_path)
 
+    def _is_timed_out(self, path: Path):
+        digest = self._timed_out.get(path)
+        if digest is None:
+            return False
+        try:
+            if SourceStamp.of(path).digest.hex() == digest:
+                return True
+        except OSError:
+            pass
+        del self._timed_out[path]
+        return False
+
+    def _on_import_timeout(self, path: Path, loader: CachedSourceFileLoader, stack: str):
+        """
+        | Called on watchdog thread, while main one is stuck in module import
+        """
+        timeout = self._config_storage.config.import_timeout
+        fork_server = ForkServer.current
+        if not (fork_server and fork_server.is_serving) or not loader.compiled:
+            logging.error(f"Import of '{path.name}' exceeded {timeout} ms, app is blocked until it's finished "
+                          f"(run with --fork-server to restart app instead), stuck at:\n{stack}")
+            return
+        logging.error(f"Import of '{path.name}' exceeded {timeout} ms, "
+                      f"restarting app without it, stuck at:\n{stack}")
+        if self._project and path.is_relative_to(self._root):
+            # Restarted app knows module from index
+            self._index_storage.update(self._project, {
+                path.relative_to(self._root).as_posix(): ModuleIndex(
+                    loader.compiled.stamp.digest.hex(), timed_out=True,
+                ),
+            })
+        self._config_storage.flush()
+        self._index_storage.flush()
+        fork_server.restart(self._get_warm_modules(), immediately=True)
+
     def unload_module(self, path: Path):
+        path = Path(path).resolve()
         if path in self._imported:
             name = self._imported[path]
             if name in sys.modules:
                 del sys.modules[name]
             del self._imported[path]
+            self._sources.forget(path)
             is_package = path.is_dir() or is_package_project(path)
             logging.info(("Package" if is_package else "Module") + f" '{name}' unloaded")
         self.on_event.invoke(ModuleLoader.EventType.ModuleUnloaded, path)
 
+    def _defer_modules(self, modules: list[Path]):
+        for module in modules:
+            try:
+                source = module.read_bytes()
+                stamp = SourceStamp.of(module, source)
+            except OSError:
+                continue
+            previews = scan_previews(module, source)
+            if previews is None:
+                logging.info(f"Previews of '{module.name}' can't be found statically, it'll be loaded now")
+                self.load_module(module)
+                continue
+            self._sources.update(module, stamp)
+            if previews:
+                self._deferred[module] = previews
+                self.on_event.invoke(ModuleLoader.EventType.ModuleDeferred, module)
+
+    def _defer_indexed(self, modules: list[Path], index: ProjectIndex):
+        """
+        | Defer modules, which weren't changed since index was saved, using previews from index
+
+        :return: Modules changed or not indexed yet
+        """
+        stale = []
+        for module in modules:
+            entry = index.modules.get(module.relative_to(self._root).as_posix())
+            try:
+                stamp = SourceStamp.of(module)
+            except OSError:
+                continue
+            if entry is None or entry.digest != stamp.digest.hex():
+                stale.append(module)
+                continue
+            if entry.timed_out:
+                self._timed_out[module] = entry.digest
+                stale.append(module)  # Loading reports it isn't imported
+                continue
+            self._sources.update(module, stamp)
+            if entry.previews:
+                self._deferred[module] = entry.previews
+                self.on_event.invoke(ModuleLoader.EventType.ModuleDeferred, module)
+        return stale
+
+    def get_deferred_previews(self, path: Path):
+        return self._deferred.get(Path(path).resolve(), tuple())
+
+    def get_dependencies(self, path: Path):
+        return self._dependencies.transitive_dependencies_of(Path(path).resolve())
+
+    def _find_project_dependencies(self, module, imports: tuple[IMPORT, ...], imported_names: set[str]):
+        names = set(imported_names)
+        for level, name, fromlist in imports:
+            try:
+                base = importlib.util.resolve_name('.' * level + name, module.__package__) if level else name
+            except (ImportError, ValueError):
+                continue
+            names.add(base)
+            names.update(f"{base}.{item}" for item in fromlist)
+        dependencies = set()
+        for name in names:
+            path = self._get_project_file(sys.modules.get(name))
+            if path:
+                dependencies.add(path)
+        return dependencies
+
+    def _get_project_file(self, module):
+        file = getattr(module, '__file__', None)
+        if not file or not self._root:
+            return None
+        path = Path(file).resolve()
+        if path.suffix != ".py" or not path.is_relative_to(self._root):
+            return None
+        return path
+
+    def _order_by_imports(self, modules: list[Path]):
+        names = dict()
+        for module in modules:
+            relative = module.relative_to(self._root).with_suffix('')
+            if relative.name == '__init__':
+                relative = relative.parent
+            names.setdefault(module.stem, module)
+            names['.'.join(relative.parts)] = module
+            names['.'.join(get_longest_module_name(module))] = module
+        graph = DependencyGraph()
+        for module in modules:
+            compiled = self._code_cache.peek(module)
+            package = '.'.join(get_longest_module_name(module.parent))
+            dependencies = set()
+            for level, name, fromlist in compiled.imports if compiled else ():
+                with contextlib.suppress(ImportError, ValueError):
+                    name = importlib.util.resolve_name('.' * level + name, package) if level else name
+                    dependencies.update(names.get(f"{name}.{item}") for item in fromlist)
+                    dependencies.add(names.get(name))
+            dependencies.discard(None)
+            graph.set_dependencies(module, dependencies)
+        return graph.affected_by(modules)
+
+    def _remember_aliases(self, names: typing.Iterable[str]):
+        for name in names:
+            path = self._get_project_file(sys.modules.get(name))
+            if path:
+                self._aliases.setdefault(path, set()).add(name)
+
+    def _forget_aliases(self, paths: set[Path]):
+        # Same file may be imported by user code under other name (e.g. `package.module`),
+        # all of them must be dropped for importers to pick up new version
+        self._remember_aliases(self._import_recorder.pop_orphans())
+        for path in paths:
+            for name in self._aliases.pop(path, ()):
+                module = sys.modules.get(name)
+                if module is not None and self._get_project_file(module) == path:
+                    del sys.modules[name]
+
     def _hard_reload(self):
+        self._config_storage.flush()  # Process is replaced, atexit handlers won't be called
+        self._index_storage.flush()
+        fork_server = ForkServer.current
+        if fork_server and fork_server.is_serving:
+            fork_server.restart(self._get_warm_modules())
         python = sys.executable
         os.execl(python, python, "\"{}\"".format(sys.argv[0]))
         exit()
+
+    def _get_warm_modules(self):
+        """
+        | Third-party modules imported by project, fork server imports them before restarting app
+        """
+        imported = set(self._imported.values())
+        return [
+            name for name in list(self._extra_imported)
+            if name in sys.modules and name not in imported
+            and not self._get_project_file(sys.modules[name])
+        ]
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+from PySimplePreview.data.preview_index_storage import PreviewIndexStorage
+from PySimplePreview.domain.interactor.abc.module_loader import ModuleLoader
+from PySimplePreview.domain.interactor.previews_manager import PreviewsManager
+from PySimplePreview.domain.model.config import is_package_project, get_package_root
+from PySimplePreview.domain.model.event import Listener
+from PySimplePreview.domain.model.preview_index import ModuleIndex
+from PySimplePreview.domain.model.source_index import SourceIndex
+
+
+class PreviewIndexUpdater:
+    """
+    | Saves previews of project modules, when package (re)load ends,
+    | so next session can show them without importing unchanged modules
+    | Only modules (un)loaded during reload are updated, whole index is rebuilt after package unload
+    | Modules, which import timed out, are kept in index, so they aren't imported in next session until changed
+    """
+
+    def __init__(
+        self,
+        loader: ModuleLoader,
+        previews: PreviewsManager,
+        sources: SourceIndex,
+        storage: PreviewIndexStorage,
+    ):
+        self._loader = loader
+        self._previews = previews
+        self._sources = sources
+        self._storage = storage
+        self._changed: set[Path] = set()
+        self._rebuild = True
+        loader.on_event += Listener(self._on_module_event, Listener.Priority.Lowest)
+
+    def _on_module_event(self, event: ModuleLoader.EventType, path: Path):
+        if event in (
+            ModuleLoader.EventType.ModuleLoaded,
+            ModuleLoader.EventType.ModuleUnloaded,
+            ModuleLoader.EventType.ModuleDeferred,
+        ):
+            self._changed.add(Path(path))
+        elif event == ModuleLoader.EventType.PackageUnloaded:
+            self._rebuild = True
+            self._changed.clear()
+        elif event == ModuleLoader.EventType.PackageReloadEnded and path and is_package_project(Path(path)):
+            self.update(Path(path))
+
+    def update(self, project: Path):
+        root = get_package_root(project)
+        if not root:
+            return
+        root = (root if root.is_dir() else root.parent).resolve()
+        modules = [module for module, _ in self._sources.items()] if self._rebuild else self._changed
+        entries = dict()
+        for module in modules:
+            if not module.is_relative_to(root):
+                continue
+            stamp = self._sources.get(module)
+            entries[module.relative_to(root).as_posix()] = None if stamp is None else ModuleIndex(
+                stamp.digest.hex(),
+                tuple(self._previews.get_previews_of(module)),
+            )
+        for module, digest in self._loader.timed_out.items():
+            if module.is_relative_to(root):
+                entries[module.relative_to(root).as_posix()] = ModuleIndex(digest, timed_out=True)
+        self._storage.update(project, entries, self._rebuild)
+        self._rebuild = False
+        self._changed.clear()
+
+    def flush(self):
+        self._storage.flush()
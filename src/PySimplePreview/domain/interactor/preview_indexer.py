@@ -0,0 +1,107 @@
+import ast
+from pathlib import Path
+
+from PySimplePreview.domain.interactor.previews_manager import get_longest_module_name
+from PySimplePreview.domain.model.preview import PreviewInfo
+
+_PREVIEW_DECORATORS = {"preview", "method_preview"}
+_GROUP_DECORATORS = {"group_previews"}
+
+
+class _Unresolvable(Exception):
+    pass
+
+
+def scan_previews(module_path: Path, source: bytes = None) -> tuple[PreviewInfo, ...] | None:
+    """
+    | Find previews declared in module with **@preview**, **@method_preview** and **@group_previews**,
+    | without module execution
+
+    :return: Previews found, or None if module declares previews in a way, that can't be resolved statically
+        (e.g. non-literal preview names), so module must be imported
+    """
+    if source is None:
+        source = module_path.read_bytes()
+    try:
+        tree = ast.parse(source, str(module_path))
+    except (SyntaxError, ValueError):
+        return None
+    module_name = '.'.join(get_longest_module_name(module_path))
+    scanner = _Scanner(module_name)
+    try:
+        scanner.visit(tree)
+    except _Unresolvable:
+        return None
+    return tuple(scanner.previews)
+
+
+def _get_decorator_name(node: ast.expr):
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _get_literal(node: ast.Call, position: int, keyword: str):
+    if len(node.args) > position:
+        value = node.args[position]
+    else:
+        value = next((item.value for item in node.keywords if item.arg == keyword), None)
+    if value is None:
+        return None
+    if isinstance(value, ast.Constant) and (value.value is None or isinstance(value.value, str)):
+        return value.value
+    raise _Unresolvable()
+
+
+class _Scanner(ast.NodeVisitor):
+    def __init__(self, module_name: str):
+        self.module_name = module_name
+        self.previews: list[PreviewInfo] = []
+        self._qualname: list[str] = []
+        self._decorators: set[int] = set()
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._decorators.update(id(item) for item in node.decorator_list)
+        self._qualname.append(node.name)
+        self.generic_visit(node)
+        self._qualname.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef):
+        self._decorators.update(id(item) for item in node.decorator_list)
+        qualname = '.'.join(self._qualname + [node.name])
+        self._scan_decorators(node, f"{self.module_name}.{qualname}")
+        self._qualname += [node.name, "<locals>"]
+        self.generic_visit(node)
+        del self._qualname[-2:]
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Call(self, node: ast.Call):
+        # Decorators used as plain functions can't be tracked back to layout source
+        if id(node) not in self._decorators and \
+                _get_decorator_name(node) in _PREVIEW_DECORATORS | _GROUP_DECORATORS:
+            raise _Unresolvable()
+        self.generic_visit(node)
+
+    def _scan_decorators(self, node: ast.FunctionDef | ast.AsyncFunctionDef, qualname: str):
+        group_name = None
+        for decorator in reversed(node.decorator_list):  # Applied bottom to top
+            name = _get_decorator_name(decorator)
+            if name in _GROUP_DECORATORS:
+                group_name = qualname
+                if isinstance(decorator, ast.Call):
+                    group_name = _get_literal(decorator, 0, "group_name") or qualname
+            elif name in _PREVIEW_DECORATORS:
+                preview_name = None
+                preview_group = None
+                if isinstance(decorator, ast.Call):
+                    preview_name = _get_literal(decorator, 0, "name")
+                    preview_group = _get_literal(decorator, 1, "group_name")
+                self.previews.append(PreviewInfo(
+                    key=f"{qualname}:{preview_name}" if preview_name else qualname,
+                    group_name=preview_group or group_name,
+                ))
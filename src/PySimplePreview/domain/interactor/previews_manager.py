@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import Callable
 
 from PySimplePreview.domain.interactor.abc.module_loader import ModuleLoader
-from PySimplePreview.domain.model.preview import LAYOUT_PROVIDER, Preview, WINDOW_PROVIDER
+from PySimplePreview.domain.model.preview import LAYOUT_PROVIDER, Preview, WINDOW_PROVIDER, PreviewInfo
 
 
 class PreviewsManager:
@@ -13,16 +13,38 @@ class PreviewsManager:
     def __init__(self, loader: ModuleLoader):
         self._previews: dict[str, Preview] = dict()
         self._groups: dict[str, set[str]] = dict()
+        # Reverse indexes, so module removal touches only its own previews
+        # (dicts used as ordered sets, so previews of module are listed in registration order)
+        self._keys_by_path: dict[Path, dict[str, None]] = dict()
+        self._path_by_key: dict[str, Path] = dict()  # Resolved once, when preview is bound
+        self._groups_by_key: dict[str, dict[str, None]] = dict()
+        self._loader = loader
         loader.on_event += self._on_module_event
 
     def _on_module_event(self, event: ModuleLoader.EventType, path: Path):
         if event == ModuleLoader.EventType.ModuleUnloaded:
             self.remove_module(path)
-        elif event == ModuleLoader.EventType.PackageReloadStarted:
+        elif event == ModuleLoader.EventType.PackageUnloaded:
             self.clear()
+        elif event == ModuleLoader.EventType.ModuleDeferred:
+            for info in self._loader.get_deferred_previews(path):
+                self.add_lazy_preview(info.key, path, info.group_name)
 
     def get(self, key: str):
-        return self._previews.get(key)
+        preview = self._previews.get(key)
+        if preview and preview.lazy:
+            self._load_lazy_preview(preview.path)
+            preview = self._previews.get(key)
+        return preview
+
+    def _load_lazy_preview(self, path: Path):
+        logging.info(f"Loading previews of '{path.name}' on demand")
+        self._loader.load_module(path, False)
+        not_found = [key for key in self._keys_by_path.get(path.resolve(), ())
+                     if self._previews[key].lazy]
+        if not_found:
+            logging.warning(f"Previews {not_found} not found in '{path.name}'")
+            self._remove_keys(not_found)
 
     def get_group(self, key: str | None):
         if key is None:
@@ -32,18 +54,44 @@ class PreviewsManager:
     def clear(self):
         self._previews.clear()
         self._groups.clear()
+        self._keys_by_path.clear()
+        self._path_by_key.clear()
+        self._groups_by_key.clear()
 
     def remove_module(self, path: Path):
-        keys = [key for key, preview in self._previews.items()
-                if preview.path.samefile(path)]
+        self._remove_keys(list(self._keys_by_path.get(Path(path).resolve(), ())))
+
+    def _remove_keys(self, keys: list[str]):
         for key in keys:
             del self._previews[key]
-            for group in self._groups.values():
-                if key in group:
-                    group.remove(key)
-        empty_groups = [key for key, value in self._groups.items() if not value]
-        for group in empty_groups:
-            del self._groups[group]
+            self._unbind_path(key)
+        self._discard_from_groups(*keys)
+
+    def _bind_path(self, key: str, path: Path):
+        path = path.resolve()
+        self._path_by_key[key] = path
+        self._keys_by_path.setdefault(path, dict())[key] = None
+
+    def _unbind_path(self, key: str):
+        path = self._path_by_key.pop(key, None)
+        keys = self._keys_by_path.get(path)
+        if keys is None:
+            return
+        keys.pop(key, None)
+        if not keys:
+            del self._keys_by_path[path]
+
+    def _add_to_group(self, key: str, group_name: str):
+        self._groups.setdefault(group_name, set()).add(key)
+        self._groups_by_key.setdefault(key, dict())[group_name] = None
+
+    def _discard_from_groups(self, *keys: str):
+        for key in keys:
+            for group_name in self._groups_by_key.pop(key, ()):
+                group = self._groups[group_name]
+                group.discard(key)
+                if not group:
+                    del self._groups[group_name]
 
     def add_preview(
         self,
@@ -64,12 +112,41 @@ class PreviewsManager:
         )
         if name in self._previews:
             old_preview = self._previews[name]
-            if old_preview.creation_time == preview.creation_time:
+            if old_preview.lazy:
+                self._discard_from_groups(name)
+            elif old_preview.creation_time == preview.creation_time:
                 logging.warning(f"Preview with key '{name}' already exists! (overwrite applied)")
+            self._unbind_path(name)
         self._previews[name] = preview
+        self._bind_path(name, module_path)
+        if group_name:
+            self._add_to_group(name, group_name)
+
+    def add_lazy_preview(self, name: str, module_path: Path, group_name: str = None):
+        """
+        | Add placeholder for preview found without module execution,
+        | module will be loaded on first access to this preview
+        """
+        if name in self._previews:
+            if not self._previews[name].lazy:
+                return
+            self._unbind_path(name)
+        self._previews[name] = Preview(path=module_path, layout=None, lazy=True)
+        self._bind_path(name, module_path)
         if group_name:
-            self._groups.setdefault(group_name, set())
-            self._groups[group_name].add(name)
+            self._add_to_group(name, group_name)
+
+    def get_previews_of(self, path: Path) -> list[PreviewInfo]:
+        """
+        | Previews registered by module at **path** (including not loaded yet)
+        """
+        return [
+            PreviewInfo(key, next(iter(self._groups_by_key.get(key, ())), None))
+            for key in self._keys_by_path.get(Path(path).resolve(), ())
+        ]
+
+    def path_of(self, key: str) -> Path | None:
+        return self._path_by_key.get(key)
 
     @property
     def previews(self):
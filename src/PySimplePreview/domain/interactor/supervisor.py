@@ -0,0 +1,114 @@
+import ctypes
+import sys
+import threading
+import traceback
+import typing
+from pathlib import Path
+
+import PySimplePreview
+
+T = typing.TypeVar('T')
+_INTERNAL_PATHS = (threading.__file__, str(Path(PySimplePreview.__file__).parent), "<frozen importlib")
+
+
+class ExecutionTimeout(TimeoutError):
+    """
+    | User code exceeded its execution budget, **stack** shows where it was stuck
+    """
+
+    def __init__(self, message: str, stack: str = ""):
+        super().__init__(message + (f", stuck at:\n{stack}" if stack else ""))
+        self.stack = stack
+
+
+class Interrupted(BaseException):
+    """
+    | Raised inside of supervised thread to stop it, derived from BaseException,
+    | so user code won't catch it with `except Exception`
+    """
+
+
+def format_thread_stack(thread: threading.Thread):
+    """
+    | Current stack of **thread**, starting from first frame of user code
+    """
+    frame = sys._current_frames().get(thread.ident)
+    if not frame:
+        return ""
+    stack = traceback.extract_stack(frame)
+    supervised = [i for i, entry in enumerate(stack) if entry.filename == __file__ and entry.name == "run_supervised"]
+    if supervised:
+        del stack[:supervised[-1] + 1]
+    while len(stack) > 1 and stack[0].filename.startswith(_INTERNAL_PATHS):
+        stack.pop(0)
+    return "".join(stack.format())
+
+
+def interrupt_thread(thread: threading.Thread):
+    """
+    | Raise :class:`Interrupted` inside of **thread** (CPython only), best-effort only:
+    | it happens once thread executes python code again (blocking calls aren't interrupted)
+    | and may land anywhere, e.g. in `finally` block, context manager exit or while lock is held,
+    | so it's used only for threads abandoned after it
+    | Main thread (it runs Tk) is never interrupted
+
+    :return: True, if interruption requested
+    """
+    if thread is threading.main_thread() or thread.ident is None or not thread.is_alive():
+        return False
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread.ident), ctypes.py_object(Interrupted))
+    return True
+
+
+def _clear_interrupt(thread: threading.Thread):
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread.ident), None)
+
+
+def run_supervised(
+        function: typing.Callable[[], T],
+        timeout: int,
+        name: str,
+        on_timeout: typing.Callable[[str], None] = None,
+) -> T:
+    """
+    | Call **function** on current thread, after **timeout** ms watchdog thread calls **on_timeout**
+    | with stack, where function is stuck, and interrupts it (see :func:`interrupt_thread`)
+    | Main thread isn't interrupted, function keeps running, so it's up to **on_timeout** to stop it
+    | :class:`ExecutionTimeout` is raised, once function exceeded **timeout**, even if it finished after all
+    | Function isn't moved to other thread, so code, which works on main thread only (signals, event loops), works
+    | Without **timeout** function called directly
+    """
+    if not timeout:
+        return function()
+    thread = threading.current_thread()
+    lock = threading.Lock()
+    state = dict(finished=False, stack=None, interrupted=False)
+
+    def on_watchdog():
+        with lock:
+            if state['finished']:
+                return
+            state['stack'] = format_thread_stack(thread)
+            state['interrupted'] = interrupt_thread(thread)
+        if on_timeout:
+            on_timeout(state['stack'])
+
+    watchdog = threading.Timer(timeout / 1000, on_watchdog)
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        try:
+            result = function()
+        finally:
+            watchdog.cancel()
+            with lock:
+                state['finished'] = True
+                if state['interrupted']:
+                    _clear_interrupt(thread)  # Interrupt may be still pending, if function finished in time
+    except Interrupted:
+        if not state['interrupted']:
+            raise
+        raise ExecutionTimeout(f"{name} exceeded {timeout} ms", state['stack']) from None
+    if state['stack'] is not None:
+        raise ExecutionTimeout(f"{name} exceeded {timeout} ms", state['stack'])
+    return result
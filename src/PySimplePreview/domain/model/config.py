@@ -1,3 +1,4 @@
+import dataclasses
 import glob
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -14,12 +15,17 @@ class Config:
     current_project: Path = None
     projects: tuple[Path, ...] = tuple()
     reload_all: bool = False
+    reload_quiet_window: int = 100
+    layout_build_timeout: int = 5000
+    import_timeout: int = 10000
+    lazy_loading: bool = False
     remember_positions: bool = True
     always_on_top: bool = True
+    reuse_window: bool = True
     integrated_preview: bool = True
     theme: str = None
     logging: LogConfig = field(default_factory=LogConfig)
-    positions: Dict[str, Position] = field(default_factory=dict)
+    positions: Dict[str, Position] = field(default_factory=dict)  # Legacy, moved to positions storage
 
     def __post_init__(self):
         self.projects = tuple(
@@ -39,6 +45,49 @@ class Config:
         self.current_project = new_project
 
 
+@dataclass(frozen=True)
+class ConfigChange:
+    """
+    | Names of config fields changed by save, nested ones prefixed with parent name (e.g. `logging.level`)
+    """
+    fields: frozenset[str]
+
+    @staticmethod
+    def of(old: Config | None, new: Config) -> 'ConfigChange':
+        return ConfigChange(frozenset(_diff_fields(old, new)))
+
+    def any(self, *names: str):
+        """
+        | At least one of fields (or their nested fields) changed
+        """
+        return any(
+            field_name == name or field_name.startswith(name + ".")
+            for field_name in self.fields for name in names
+        )
+
+    def only(self, *names: str):
+        """
+        | Nothing changed, except these fields (or their nested fields)
+        """
+        return all(ConfigChange(frozenset((field_name,))).any(*names) for field_name in self.fields)
+
+    def __bool__(self):
+        return bool(self.fields)
+
+
+def _diff_fields(old, new, prefix=""):
+    for config_field in dataclasses.fields(new):
+        name = config_field.name
+        new_value = getattr(new, name)
+        old_value = getattr(old, name) if old is not None else dataclasses.MISSING
+        if new_value == old_value:
+            continue
+        if dataclasses.is_dataclass(new_value) and dataclasses.is_dataclass(old_value):
+            yield from _diff_fields(old_value, new_value, f"{prefix}{name}.")
+        else:
+            yield prefix + name
+
+
 def is_valid_project(path: Path):
     return path.exists() and (
         path.is_file() and path.suffix == ".py" or
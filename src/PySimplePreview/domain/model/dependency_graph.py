@@ -0,0 +1,80 @@
+from collections import deque
+from pathlib import Path
+from typing import Iterable
+
+
+class DependencyGraph:
+    def __init__(self):
+        self._dependencies: dict[Path, set[Path]] = dict()
+        self._dependents: dict[Path, set[Path]] = dict()
+
+    def set_dependencies(self, module: Path, dependencies: Iterable[Path]):
+        dependencies = set(dependencies)
+        dependencies.discard(module)
+        for dependency in self._dependencies.pop(module, set()) - dependencies:
+            self._dependents.get(dependency, set()).discard(module)
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(module)
+        self._dependencies[module] = dependencies
+
+    def remove(self, module: Path):
+        self.set_dependencies(module, ())
+        del self._dependencies[module]
+
+    def clear(self):
+        self._dependencies.clear()
+        self._dependents.clear()
+
+    def dependencies_of(self, module: Path):
+        return frozenset(self._dependencies.get(module, ()))
+
+    def transitive_dependencies_of(self, module: Path):
+        """
+        | Modules imported by **module** directly or through other modules
+        """
+        visited = set()
+        queue = deque(self._dependencies.get(module, ()))
+        while queue:
+            dependency = queue.popleft()
+            if dependency not in visited:
+                visited.add(dependency)
+                queue.extend(self._dependencies.get(dependency, ()))
+        visited.discard(module)
+        return frozenset(visited)
+
+    def affected_by(self, modules: Iterable[Path]):
+        """
+        | Collect **modules** and all of their transitive importers
+        | Result is ordered topologically: each module goes after everything it imports
+        | (import cycles are broken in discovery order)
+        """
+        affected = list(dict.fromkeys(modules))
+        visited = set(affected)
+        queue = deque(affected)
+        while queue:
+            for dependent in self._dependents.get(queue.popleft(), ()):
+                if dependent not in visited:
+                    visited.add(dependent)
+                    affected.append(dependent)
+                    queue.append(dependent)
+
+        pending = {
+            node: len(self._dependencies.get(node, set()) & visited)
+            for node in affected
+        }
+        ready = deque(node for node in affected if not pending[node])
+        result = []
+        while pending:
+            if not ready:
+                ready.append(next(node for node in affected if node in pending))
+            node = ready.popleft()
+            if node not in pending:
+                continue
+            del pending[node]
+            result.append(node)
+            for dependent in self._dependents.get(node, ()):
+                if dependent in pending:
+                    pending[dependent] -= 1
+                    if not pending[dependent]:
+                        ready.append(dependent)
+        return result
@@ -22,6 +22,7 @@ class LogConfig:
     level: LoggingLevel = LoggingLevel.INFO
     write_to: LoggingDestination = LoggingDestination.CONSOLE
     file_path: Path = field(default_factory=lambda: Path("./logs/latest.log"))
+    panel_capacity: int = 1000  # Records shown in app's log panel
 
     def __post_init__(self):
         if self.write_to == self.LoggingDestination.FILE \
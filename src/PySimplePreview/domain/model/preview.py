@@ -17,10 +17,17 @@ WINDOW_PROVIDER: typing.TypeAlias = typing.Callable[[
 @dataclass
 class Preview:
     path: Path
-    layout: LAYOUT_PROVIDER
+    layout: LAYOUT_PROVIDER | None
     creation_time: int = field(default_factory=lambda: int(time.time()))
     window: WINDOW_PROVIDER = None
+    lazy: bool = False
 
     @property
     def internal(self):
         return self.window is None
+
+
+@dataclass(frozen=True)
+class PreviewInfo:
+    key: str
+    group_name: str = None
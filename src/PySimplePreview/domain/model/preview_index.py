@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+from PySimplePreview.domain.model.preview import PreviewInfo
+
+
+@dataclass
+class ModuleIndex:
+    digest: str
+    previews: tuple[PreviewInfo, ...] = tuple()
+    timed_out: bool = False  # Import exceeded its budget, module isn't imported until changed
+
+
+@dataclass
+class ProjectIndex:
+    modules: Dict[str, ModuleIndex] = field(default_factory=dict)
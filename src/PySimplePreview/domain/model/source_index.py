@@ -0,0 +1,57 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class SourceStamp:
+    mtime_ns: int
+    size: int
+    digest: bytes
+
+    @classmethod
+    def of(cls, path: Path, source: bytes = None):
+        stat = os.stat(path)
+        if source is None:
+            source = path.read_bytes()
+        return cls(stat.st_mtime_ns, stat.st_size, hashlib.sha1(source).digest())
+
+
+class SourceIndex:
+    def __init__(self):
+        self._stamps: dict[Path, SourceStamp] = dict()
+
+    def update(self, path: Path, stamp: SourceStamp):
+        self._stamps[path.resolve()] = stamp
+
+    def get(self, path: Path) -> SourceStamp | None:
+        return self._stamps.get(path.resolve())
+
+    def forget(self, path: Path):
+        self._stamps.pop(path.resolve(), None)
+
+    def clear(self):
+        self._stamps.clear()
+
+    def items(self):
+        return tuple(self._stamps.items())
+
+    def is_changed(self, path: Path):
+        path = path.resolve()
+        stamp = self._stamps.get(path)
+        if stamp is None:
+            return True
+        try:
+            stat = os.stat(path)
+            if (stat.st_mtime_ns, stat.st_size) == (stamp.mtime_ns, stamp.size):
+                return False
+            if stat.st_size != stamp.size:
+                return True
+            new_stamp = SourceStamp.of(path)
+        except OSError:
+            return True
+        if new_stamp.digest != stamp.digest:
+            return True
+        self._stamps[path] = new_stamp  # Content is the same, only metadata changed
+        return False
@@ -0,0 +1,135 @@
+import bisect
+import contextlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+
+class Tracer:
+    """
+    | Collects durations of named spans (file change -> reload -> layout -> window)
+    | Keeps rolling window of latest samples per span, optionally writes every span to JSON lines file
+    """
+    WINDOW = 200
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+    _BARS = " ▁▂▃▄▅▆▇█"
+
+    def __init__(self):
+        self._samples: dict[str, deque[float]] = dict()
+        self._marks: dict[str, float] = dict()
+        self._lock = threading.Lock()
+        self._trace_file = None
+        self._clock_offset = time.time() - time.perf_counter()
+
+    def trace_to(self, path: Path | None):
+        """
+        | Write every span to **path** (appended), or stop writing with None
+        """
+        with self._lock:
+            self._close_trace_file()
+            if path:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._trace_file = open(path, 'a', encoding='utf-8', buffering=1)
+
+    def close(self):
+        """
+        | Stop writing spans to file, collected samples are kept
+        """
+        with self._lock:
+            self._close_trace_file()
+
+    def _close_trace_file(self):
+        if self._trace_file:
+            with contextlib.suppress(OSError):
+                self._trace_file.close()
+            self._trace_file = None
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter(), **attributes)
+
+    def record(self, name: str, start: float, end: float, **attributes):
+        duration = (end - start) * 1000
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.WINDOW)).append(duration)
+            if not self._trace_file:
+                return
+            try:
+                self._trace_file.write(json.dumps(dict(
+                    name=name,
+                    ts=round(start + self._clock_offset, 6),
+                    duration_ms=round(duration, 3),
+                    thread=threading.current_thread().name,
+                    **attributes,
+                ), default=str) + "\n")
+            except OSError as e:
+                logging.warning(f"Trace can't be written, tracing stopped: {e}")
+                self._close_trace_file()
+
+    def mark(self, name: str, start: float = None):
+        """
+        | Remember start of span, which ends somewhere else (see :meth:`record_since`),
+        | without **start** the earliest not consumed mark is kept
+        """
+        with self._lock:
+            if start is None:
+                self._marks.setdefault(name, time.perf_counter())
+            else:
+                self._marks[name] = start
+
+    def record_since(self, mark: str, name: str, **attributes) -> float | None:
+        """
+        | Record span started with :meth:`mark`, mark is consumed
+
+        :return: Start of span, or None if there is no such mark
+        """
+        with self._lock:
+            start = self._marks.pop(mark, None)
+        if start is not None:
+            self.record(name, start, time.perf_counter(), **attributes)
+        return start
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._marks.clear()
+
+    def summary(self):
+        """
+        | Text histogram of latest span durations
+        """
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+        if not samples:
+            return "No timings collected yet"
+        width = max(map(len, samples))
+        buckets = "  ".join(f"{bound}" for bound in self.BUCKETS_MS)
+        lines = [f"{'span':<{width}}     n     p50     p90     max  histogram (<= {buckets} ms, more)"]
+        for name, values in samples.items():
+            lines.append(
+                f"{name:<{width}} {len(values):>5} "
+                f"{_percentile(values, 0.5):>7.1f} {_percentile(values, 0.9):>7.1f} {values[-1]:>7.1f}  "
+                f"{self._histogram(values)}"
+            )
+        return "\n".join(lines)
+
+    def _histogram(self, values: list[float]):
+        counts = [0] * (len(self.BUCKETS_MS) + 1)
+        for value in values:
+            counts[bisect.bisect_left(self.BUCKETS_MS, value)] += 1
+        highest = max(counts)
+        return "".join(
+            self._BARS[0 if not count else max(1, round(count / highest * (len(self._BARS) - 1)))]
+            for count in counts
+        )
+
+
+def _percentile(values: list[float], part: float):
+    return values[min(len(values) - 1, int(len(values) * part))]
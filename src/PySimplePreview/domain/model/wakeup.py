@@ -0,0 +1,23 @@
+import threading
+import typing
+
+from PySimplePreview.domain.model.event import InvokableEvent
+
+
+class Wakeup:
+    def __init__(self):
+        self._event = threading.Event()
+        self._on_notify = InvokableEvent[typing.Callable[[], None]]()
+        self.on_notify = self._on_notify.base
+
+    def notify(self):
+        if self._event.is_set():
+            return
+        self._event.set()
+        self._on_notify.invoke()
+
+    def wait(self, timeout: int | None):
+        return self._event.wait(timeout / 1000 if timeout is not None else None)
+
+    def reset(self):
+        self._event.clear()
@@ -5,9 +5,13 @@ import punq
 from PySimplePreview.data.config_storage import ConfigStorage
 from PySimplePreview.domain.interactor.abc.files_observer import ProjectObserver
 from PySimplePreview.domain.interactor.abc.module_loader import ModuleLoader
+from PySimplePreview.domain.interactor.preview_index_updater import PreviewIndexUpdater
+from PySimplePreview.domain.model.tracing import Tracer
 from PySimplePreview.view.controller.preview_settings import PreviewSettingsWindowController
 from PySimplePreview.view.controller.system_args_handler import SystemArgsHandler
 from PySimplePreview.view.log import LoggingConfigurator
+from PySimplePreview.view.positions_pruner import PreviewPositionsPruner
+from PySimplePreview.view.scheduler import Scheduler
 
 
 class Application:
@@ -18,29 +22,45 @@ class Application:
         config_storage: ConfigStorage,
         runner: PreviewSettingsWindowController,
         module_loader: ModuleLoader,
+        preview_index_updater: PreviewIndexUpdater,
+        positions_pruner: PreviewPositionsPruner,
         project_observer: ProjectObserver,
         ars_handler: SystemArgsHandler,
         logger_configurator: LoggingConfigurator,
+        scheduler: Scheduler,
+        tracer: Tracer,
         container: punq.Container,
     ):
         self._config_storage = config_storage
         self._runner = runner
         self._ars_handler = ars_handler
         self._module_loader = module_loader
+        self._preview_index_updater = preview_index_updater
+        self._positions_pruner = positions_pruner
         self._project_observer = project_observer
         self._logger_configurator = logger_configurator
+        self._scheduler = scheduler
+        self._tracer = tracer
         self.__class__.current = self
         self.container = container
 
-    def run(self):
+    def handle_args(self):
         self._ars_handler.run()
+
+    def run(self):
+        self.handle_args()
         self._logger_configurator.setup()
         with self._project_observer.track():
             with suppress(KeyboardInterrupt):
                 print("PySimplePreview started!")
                 print("Press Ctrl + C to exit")
-                self._module_loader.setup()
-                self._runner.refresh_layout()
-                while True:
-                    self._project_observer.dispatch_events()
-                    self._runner.step()
+                try:
+                    self._module_loader.setup()
+                    self._runner.refresh_layout()
+                    while True:
+                        self._scheduler.step()
+                finally:
+                    # Forked app exits without atexit handlers called
+                    self._config_storage.flush()
+                    self._preview_index_updater.flush()
+                    self._tracer.close()
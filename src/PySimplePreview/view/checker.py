@@ -0,0 +1,330 @@
+import contextlib
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+import multiprocessing.util
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import PySimpleGUI as sg
+
+from PySimplePreview.data.config_storage import ConfigStorage
+from PySimplePreview.data.previews_storage import PreviewsStorage
+from PySimplePreview.domain.interactor.abc.module_loader import ModuleLoader
+from PySimplePreview.domain.model.preview import Preview, LAYOUT
+from PySimplePreview.domain.model.source_index import SourceStamp
+from PySimplePreview.view.log import LoggingConfigurator
+from PySimplePreview.view.visual_diff import VisualBaseline, DiffResult, DiffStatus
+
+
+class DisplayError(RuntimeError):
+    pass
+
+
+@dataclass
+class CheckOptions:
+    group: str | None = None
+    screenshots_dir: Path | None = None
+    workers: int = 1
+    baseline_dir: Path | None = None
+    tolerance: float = 0.0
+    update_baseline: bool = False
+
+
+@dataclass
+class CheckResult:
+    key: str
+    build_time: float = 0.0
+    render_time: float = 0.0
+    error: str | None = None
+    screenshot: Path | None = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class _ErrorsCollector(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+
+class PreviewsChecker:
+    """
+    | Batch mode for CI: loads current project, builds and renders every preview
+    | in hidden windows, then reports failures and timings
+    | Optionally saves screenshot of every preview, previews may be distributed
+    | across process pool (each worker has own Tk interpreter)
+    """
+    EXIT_OK = 0
+    EXIT_FAILED = 1
+    EXIT_NO_PREVIEWS = 2
+
+    def __init__(
+        self,
+        config_storage: ConfigStorage,
+        module_loader: ModuleLoader,
+        previews_storage: PreviewsStorage,
+        logging_configurator: LoggingConfigurator,
+    ):
+        self._config_storage = config_storage
+        self._module_loader = module_loader
+        self._previews_storage = previews_storage
+        self._logging_configurator = logging_configurator
+        self.options = CheckOptions()
+
+    @property
+    def _previews(self):
+        return self._previews_storage.previews
+
+    def run(self) -> int:
+        self._logging_configurator.setup()
+        project = self._config_storage.config.current_project
+        if not project:
+            print("No project selected, use --project-path option")
+            return self.EXIT_NO_PREVIEWS
+        if (self.options.screenshots_dir or self.options.baseline_dir) and not importlib.util.find_spec('PIL'):
+            print("Screenshots require 'Pillow' package to be installed")
+            return self.EXIT_FAILED
+        if self.options.baseline_dir and not importlib.util.find_spec('numpy'):
+            print("Comparison with baseline requires 'numpy' package to be installed")
+            return self.EXIT_FAILED
+        try:
+            _ensure_display()
+        except DisplayError as e:
+            print(e)
+            return self.EXIT_FAILED
+        # Display is needed already on import: project modules may create Tk objects, fonts or images
+        with _display():
+            return self._check_project(project)
+
+    def _check_project(self, project: Path):
+        load_errors = self.load_project()
+        for record in load_errors:
+            print(f"FAILED  import: {record.getMessage()}")
+        keys = self._previews.get_group(self.options.group)
+        if not keys:
+            print("No previews found")
+            return self.EXIT_NO_PREVIEWS
+        baseline = None
+        digests = dict()
+        skipped = tuple()
+        if self.options.baseline_dir:
+            baseline = VisualBaseline(self.options.baseline_dir, self.options.tolerance)
+            digests = self._get_preview_digests(keys)
+            skipped = tuple(key for key in keys
+                            if baseline.is_unchanged(key, get_screenshot_name(key), digests[key]))
+            keys = tuple(key for key in keys if key not in skipped)
+        with contextlib.ExitStack() as stack:
+            if baseline and not self.options.screenshots_dir:
+                self.options.screenshots_dir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+            if self.options.screenshots_dir:
+                self.options.screenshots_dir.mkdir(parents=True, exist_ok=True)
+            start = time.perf_counter()
+            results = self._check_all(project, keys) if keys else []
+            self._report(results, time.perf_counter() - start)
+            failed = len(load_errors) + sum(not result.ok for result in results)
+            if baseline:
+                diffs = [DiffResult(key, DiffStatus.SKIPPED) for key in skipped]
+                diffs += [
+                    baseline.compare(result.key, result.screenshot, digests[result.key],
+                                     self.options.update_baseline)
+                    if result.ok else DiffResult(result.key, DiffStatus.FAILED)
+                    for result in results
+                ]
+                baseline.save()
+                self._report_diffs(diffs)
+                if not self.options.update_baseline:
+                    failed += sum(diff.status == DiffStatus.CHANGED for diff in diffs)
+        return self.EXIT_FAILED if failed else self.EXIT_OK
+
+    def _get_preview_digests(self, keys: tuple[str, ...]):
+        """
+        | Digest of each preview's module together with project modules it imports (e.g. shared helpers, themes),
+        | so change of any of them makes preview rendered again
+        """
+        source_digests = dict()
+        preview_digests = dict()
+        digests = dict()
+        for key in keys:
+            path = self._previews.get(key).path.resolve()
+            if path not in preview_digests:
+                sources = sorted({path} | self._module_loader.get_dependencies(path))
+                for source in sources:
+                    if source not in source_digests:
+                        source_digests[source] = SourceStamp.of(source).digest if source.exists() else b""
+                digest = hashlib.sha1()
+                for source in sources:
+                    digest.update(source_digests[source])
+                preview_digests[path] = digest.hexdigest()
+            digests[key] = preview_digests[path]
+        return digests
+
+    def _check_all(self, project: Path, keys: tuple[str, ...]):
+        workers = min(self.options.workers, len(keys))
+        # Screenshot is grabbed from screen area, so windows of workers sharing display would get into each other's
+        own_display = bool(self.options.screenshots_dir) and workers > 1
+        if own_display and not _can_start_virtual_display():
+            print("Screenshots are taken by single worker: "
+                  "separate display for each worker requires 'pyvirtualdisplay' (with Xvfb)")
+            workers = 1
+        if workers <= 1:
+            return [self.check(key) for key in keys]
+        # Spawned workers don't share tkinter state, each one imports project on its own
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+            workers, mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._config_storage.filename, project, self.options, own_display),
+        ) as pool:
+            return list(pool.map(_check_in_worker, keys))
+
+    def load_project(self):
+        errors = _ErrorsCollector()
+        logging.getLogger().addHandler(errors)
+        try:
+            self._module_loader.setup()
+            while self._module_loader.has_pending:
+                self._module_loader.load_pending()
+            for key in self._previews.previews:
+                self._previews.get(key)  # Loads lazy previews
+        finally:
+            logging.getLogger().removeHandler(errors)
+        return errors.records
+
+    def check(self, key: str):
+        result = CheckResult(key)
+        preview = self._previews.get(key)
+        try:
+            start = time.perf_counter()
+            layout = preview.layout()
+            result.build_time = time.perf_counter() - start
+            if self.options.screenshots_dir:
+                result.screenshot = self.options.screenshots_dir / get_screenshot_name(key)
+            start = time.perf_counter()
+            self._render(preview, layout, result.screenshot)
+            result.render_time = time.perf_counter() - start
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            result.screenshot = None
+        return result
+
+    @staticmethod
+    def _render(preview: Preview, layout: LAYOUT, screenshot: Path = None):
+        # Window must be opaque to be captured
+        location = (0, 0) if screenshot else (None, None)
+        if preview.window:
+            window = preview.window((None, None), location, layout)
+        else:
+            window = sg.Window(
+                preview.path.stem, layout,
+                location=location,
+                alpha_channel=1.0 if screenshot else 0.0,
+            )
+        try:
+            window.finalize()
+            if screenshot:
+                _save_screenshot(window, screenshot)
+        finally:
+            window.close()
+
+    @staticmethod
+    def _report(results: list[CheckResult], elapsed: float):
+        for result in results:
+            status = "OK" if result.ok else "FAILED"
+            print(f"{status:<7} build {result.build_time * 1000:8.1f} ms  "
+                  f"render {result.render_time * 1000:8.1f} ms  {result.key}")
+            if not result.ok:
+                print(f"        {result.error}")
+        failed = sum(not result.ok for result in results)
+        print(f"{len(results)} preview(s) checked in {elapsed:.2f} s, {failed} failed")
+
+    def _report_diffs(self, diffs: list[DiffResult]):
+        for diff in diffs:
+            if diff.status in (DiffStatus.CHANGED, DiffStatus.NEW):
+                print(f"{diff.status.value.upper():<7} {diff.ratio:8.2%} pixels differ  {diff.key}")
+        counts = {status: sum(diff.status == status for diff in diffs) for status in DiffStatus}
+        print(", ".join(f"{count} {status.value}" for status, count in counts.items())
+              + (" (baseline updated)" if self.options.update_baseline else ""))
+
+
+def get_screenshot_name(key: str):
+    # Readable part may be the same for different keys (e.g. `a.b-c` and `a.b_c`), hash keeps names distinct
+    key_hash = hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+    return re.sub(r'[^\w.\-]+', '_', key) + f"-{key_hash}.png"
+
+
+def _save_screenshot(window: sg.Window, path: Path):
+    from PIL import ImageGrab
+    window.refresh()
+    root = window.TKroot
+    x, y = root.winfo_rootx(), root.winfo_rooty()
+    ImageGrab.grab((x, y, x + root.winfo_width(), y + root.winfo_height())).save(path)
+
+
+_worker_checker: PreviewsChecker = None
+_worker_resources = contextlib.ExitStack()
+
+
+def _init_worker(config_filename: str, project: Path, options: CheckOptions, own_display: bool):
+    global _worker_checker
+    import punq
+    from PySimplePreview import di
+    from PySimplePreview.view.app import Application
+
+    logging.disable(logging.INFO)
+    # Pool workers exit without atexit handlers, but multiprocessing finalizers are run
+    multiprocessing.util.Finalize(None, _worker_resources.close, exitpriority=10)
+    _worker_resources.enter_context(_display(own_display))
+    container = punq.Container()
+    di.configure_di(container)
+    config_storage = container.resolve(ConfigStorage)
+    config_storage.filename = config_filename
+    config_storage.config.add_project(project)
+    container.resolve(Application)  # Previews are registered only while application exists
+    _worker_checker = container.resolve(PreviewsChecker)
+    _worker_checker.options = options
+    _worker_checker.load_project()
+
+
+def _check_in_worker(key: str):
+    return _worker_checker.check(key)
+
+
+def _needs_virtual_display():
+    return sys.platform.startswith('linux') and not os.environ.get('DISPLAY')
+
+
+def _can_start_virtual_display():
+    return sys.platform.startswith('linux') and importlib.util.find_spec('pyvirtualdisplay') is not None
+
+
+def _ensure_display():
+    if _needs_virtual_display() and not _can_start_virtual_display():
+        raise DisplayError("No display found, install 'pyvirtualdisplay' (with Xvfb) or use xvfb-run")
+
+
+@contextlib.contextmanager
+def _display(own=False):
+    """
+    | Provide virtual display (Xvfb) when there is no display available, or when **own** display is required
+    """
+    if not own and not _needs_virtual_display():
+        yield
+        return
+    if not _can_start_virtual_display():
+        raise DisplayError("Virtual display requires 'pyvirtualdisplay' (with Xvfb)")
+    from pyvirtualdisplay import Display
+    with Display(visible=False):
+        yield
@@ -16,3 +16,7 @@ class SettingsEvents(Enum):
     LOG_FILE_PATH = auto()
     LOG = auto()
     ALWAYS_ON_TOP = auto()
+    LAZY_LOADING = auto()
+    REUSE_WINDOW = auto()
+    PREVIEW_CONTAINER = auto()
+    SHOW_TIMINGS = auto()
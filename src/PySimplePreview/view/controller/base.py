@@ -1,5 +1,4 @@
 import logging
-import time
 import typing
 from abc import ABCMeta, abstractmethod
 from queue import Queue
@@ -7,17 +6,27 @@ from queue import Queue
 import PySimpleGUI as sg
 
 from PySimplePreview.data.config_storage import ConfigStorage
-from PySimplePreview.domain.model.config import Config
+from PySimplePreview.domain.model.config import Config, ConfigChange
 from PySimplePreview.domain.model.position import Position, PositionWithFallback
 from PySimplePreview.domain.model.preview import LAYOUT_PROVIDER, LAYOUT
+from PySimplePreview.domain.model.tracing import Tracer
+from PySimplePreview.domain.model.wakeup import Wakeup
 from PySimplePreview.view.controller.utils import WindowHolder
-from PySimplePreview.view.layouts import get_nocontent_layout
+from PySimplePreview.view.layout_builder import LayoutBuilder, BuiltLayout
+from PySimplePreview.view.layouts import get_nocontent_layout, get_building_layout
 from PySimplePreview.view.models import PositionViewDTO
 
 
 class BaseController(metaclass=ABCMeta):
-    def __init__(self, config: ConfigStorage):
+    # Config fields, which don't affect windows
+    _HIDDEN_FIELDS = (
+        "reload_quiet_window", "layout_build_timeout", "import_timeout", "positions", "logging.panel_capacity",
+    )
+
+    def __init__(self, config: ConfigStorage, wakeup: Wakeup, tracer: Tracer):
         self._configs_storage = config
+        self._wakeup = wakeup
+        self._tracer = tracer
         self._window_holder = WindowHolder()
         self._position_controller = PositionWithFallback(
             lambda key: config.positions.get(key, None),
@@ -27,10 +36,22 @@ class BaseController(metaclass=ABCMeta):
             use_other=False
         )
         self.queue = Queue()
+        self._layout_builder = LayoutBuilder(self.queue, wakeup, tracer)
 
-    def _on_config_update(self, config: Config):
+    def _on_config_update(self, config: Config, change: ConfigChange):
+        if change.only(*self._HIDDEN_FIELDS):
+            return
         self.refresh_layout()
 
+    def _apply_keep_on_top(self):
+        window = self.window
+        if window is None or window.is_closed():
+            return
+        if self._config.always_on_top:
+            window.keep_on_top_set()
+        else:
+            window.keep_on_top_clear()
+
     @abstractmethod
     def _set_layout(self, layout):
         pass
@@ -39,8 +60,9 @@ class BaseController(metaclass=ABCMeta):
                     layout: LAYOUT,
                     fallback_layout: typing.Callable[[Exception], LAYOUT]) -> sg.Window:
         try:
-            window = self._make_window(layout, *self._position.as_tuple)
-            window.finalize()
+            with self._tracer.span("window.make", controller=self.name):
+                window = self._make_window(layout, *self._position.as_tuple)
+                window.finalize()
             return window
         except Exception as e:
             logging.error(f"User defined layout can't be rendered: {e}")
@@ -57,19 +79,54 @@ class BaseController(metaclass=ABCMeta):
     ) -> sg.Window:
         pass
 
+    def _show_placeholder(self):
+        self._set_layout(get_building_layout)
+
+    def _apply_layout(self, item: LAYOUT_PROVIDER | BuiltLayout):
+        """
+        | Start build of requested layout provider, or show built layout
+
+        :return: True, if layout shown
+        """
+        if isinstance(item, BuiltLayout):
+            if not self._layout_builder.is_current(item):
+                return False  # Newer build already started
+            self._set_layout(item.provider)
+            return True
+        built = self._layout_builder.build(item, self._config.layout_build_timeout)
+        if built is None:
+            self._show_placeholder()
+            return False
+        self._set_layout(built.provider)
+        return True
+
     def step(self):
-        if not self.queue.empty():
-            self._set_layout(self.queue.get_nowait())
+        item = None
+        while not self.queue.empty():
+            queued = self.queue.get_nowait()
+            if isinstance(queued, BuiltLayout) and not self._layout_builder.is_current(queued):
+                continue  # Newer layout requested after this build started
+            item = queued  # Only the latest layout matters
+        shown = item is not None and self._apply_layout(item)
         try:
             result = self._window_holder.step()
+            if shown:
+                # Reload is visible to user once new layout is shown
+                self._tracer.record_since("reload", "reload.total", controller=self.name)
             if result:
                 event, values = result
                 self._handle_event(event, values)
-            else:
-                time.sleep(1)
         except Exception as e:
             logging.exception(f"Error in controller '{self.name}'", exc_info=e)
-            time.sleep(1)
+
+    def dispatch(self, window: sg.Window, event, values):
+        if not self._window_holder.owns(window):
+            return False
+        try:
+            self._handle_event(event, values)
+        except Exception as e:
+            logging.exception(f"Error in controller '{self.name}'", exc_info=e)
+        return True
 
     @property
     def _position(self):
@@ -77,8 +134,7 @@ class BaseController(metaclass=ABCMeta):
 
     @_position.setter
     def _position(self, value: Position):
-        self._position_controller.position = value
-        self._configs_storage.save(False)
+        self._position_controller.position = value  # Positions storage persists it on its own
 
     @property
     def name(self):
@@ -91,6 +147,7 @@ class BaseController(metaclass=ABCMeta):
                 self._window_holder.window.current_location(True),
             )
         elif event is None:
+            self._layout_builder.cancel()
             self._window_holder.close()
         elif event == sg.TIMEOUT_EVENT:
             pass
@@ -110,7 +167,13 @@ class BaseController(metaclass=ABCMeta):
 
     @layout.setter
     def layout(self, value: LAYOUT_PROVIDER):
+        self._layout_builder.cancel()  # Builds of previous layout are stale now
         self.queue.put_nowait(value)
+        self._wakeup.notify()
+
+    @property
+    def window(self) -> sg.Window | None:
+        return self._window_holder.window
 
     def _set_window(self, window: sg.Window):
         window.bind('<Configure>', "Configure")
@@ -5,7 +5,10 @@ import PySimpleGUI as sg
 from PySimplePreview.data.config_storage import ConfigStorage
 from PySimplePreview.data.previews_storage import PreviewsStorage
 from PySimplePreview.domain.model.preview import LAYOUT_PROVIDER, LAYOUT
+from PySimplePreview.domain.model.tracing import Tracer
+from PySimplePreview.domain.model.wakeup import Wakeup
 from PySimplePreview.view.controller.base import BaseController
+from PySimplePreview.view.layout_diff import RenderedLayout
 from PySimplePreview.view.layouts import get_preview_layout_frame, get_unpacked_layout, get_exception_layout
 
 
@@ -15,17 +18,27 @@ class ExternalPreviewWindowController(BaseController):
         preview_key,
         config: ConfigStorage,
         previews: PreviewsStorage,
+        wakeup: Wakeup,
+        tracer: Tracer,
     ):
-        super().__init__(config)
+        super().__init__(config, wakeup, tracer)
         self.__key = preview_key
         self._previews_storage = previews
-        self._position_controller.other_key += "|" + preview_key
+        self._position_controller.other_key = self.position_key_of(preview_key)
         self._window_provider = None
+        self._rendered: RenderedLayout | None = None
 
     @property
     def key(self):
         return self.__key
 
+    @classmethod
+    def position_key_of(cls, preview_key: str):
+        """
+        | Key of window size stored for preview, location is shared by all previews
+        """
+        return f"{cls.__name__}|{preview_key}"
+
     def _get_layout(self):
         new_layout = self._previews.get(self.key)
         return new_layout.layout if new_layout else None
@@ -39,9 +52,42 @@ class ExternalPreviewWindowController(BaseController):
             [get_preview_layout_frame(layout, self.key or "")],
         ]
 
+    def _patch_layout(self, new_layout: LAYOUT):
+        """
+        | Apply changes of default preview window's layout without window rebuild
+        | (**new_layout** isn't modified, so it can be used for rebuild)
+
+        :return: False, when window must be rebuilt
+        """
+        window = self._window_holder.window
+        if not self._config.reuse_window or self._rendered is None or window is None or window.is_closed():
+            return False
+        try:
+            return self._rendered.patch(new_layout)
+        except Exception as e:
+            logging.debug(f"Preview can't be patched, window will be rebuilt: {e}")
+            return False
+
+    def _apply_keep_on_top(self):
+        if self._window_provider:
+            return  # Custom window decides on its own
+        super()._apply_keep_on_top()
+
+    def _show_placeholder(self):
+        preview = self._previews.get(self.key)
+        if preview and preview.window and self.window:
+            return  # Custom window may not expect placeholder, so previous one is kept
+        super()._show_placeholder()
+
     def _set_layout(self, layout: LAYOUT_PROVIDER):
         preview = self._previews.get(self.key)
+        new_layout = None
+        if not preview or not preview.window:
+            new_layout = self.make_layout(layout)  # Provider is called once for both patch and rebuild
+            if self._patch_layout(new_layout):
+                return
         window: sg.Window | None = None
+        self._rendered = None
         self._position_controller.use_other = False
         if preview and preview.window:
             try:
@@ -58,11 +104,15 @@ class ExternalPreviewWindowController(BaseController):
                 logging.exception("Custom window creation failed. Fallback to default one.", exc_info=e)
         if not window:
             window = self.make_window(
-                self.make_layout(layout),
-                lambda e: self.make_layout(lambda: get_exception_layout(e))
+                self._make_rendered_layout(new_layout or self.make_layout(layout)),
+                lambda e: self._make_rendered_layout(self.make_layout(lambda: get_exception_layout(e)))
             )
         super()._set_window(window)
 
+    def _make_rendered_layout(self, new_layout: LAYOUT):
+        self._rendered = RenderedLayout(new_layout)
+        return new_layout
+
     def _make_window(
         self,
         layout: LAYOUT,
@@ -1,3 +1,4 @@
+import logging
 import os
 import sys
 from pathlib import Path
@@ -7,22 +8,29 @@ import PySimpleGUI as sg
 from PySimplePreview.data.config_storage import ConfigStorage
 from PySimplePreview.data.previews_storage import PreviewsStorage
 from PySimplePreview.domain.interactor.abc.files_observer import ProjectObserver
-from PySimplePreview.domain.model.config import is_valid_project
+from PySimplePreview.domain.model.config import is_valid_project, Config, ConfigChange
 from PySimplePreview.domain.model.event import Listener
 from PySimplePreview.domain.model.log_config import LogConfig
 from PySimplePreview.domain.model.position import Position
 from PySimplePreview.domain.model.preview import LAYOUT_PROVIDER, LAYOUT
+from PySimplePreview.domain.model.tracing import Tracer
+from PySimplePreview.domain.model.wakeup import Wakeup
 from PySimplePreview.view.contracts import SettingsEvents
 from PySimplePreview.view.controller.base import BaseController
 from PySimplePreview.view.controller.external_preview_factory import ExternalPreviewWindowControllerFactory
+from PySimplePreview.view.controller.utils import replace_content
+from PySimplePreview.view.layout_diff import RenderedLayout
 from PySimplePreview.view.layouts import get_settings_layout, get_preview_layout_frame, get_log_layout, \
-    get_exception_layout
+    get_exception_layout, get_preview_container, get_settings_menu
 from PySimplePreview.view.log import LoggingConfigurator
 from PySimplePreview.view.models import map_config_to_view, shorten_preview_names, ListItem, map_log_config_to_view, \
     map_from_menu_view
 
 
 class PreviewSettingsWindowController(BaseController):
+    # Config fields, which can be reflected in current window without rebuild
+    _IN_PLACE_FIELDS = ("always_on_top", "remember_positions", "reuse_window", "logging.level")
+
     def __init__(
         self,
         config: ConfigStorage,
@@ -30,8 +38,10 @@ class PreviewSettingsWindowController(BaseController):
         project_observer: ProjectObserver,
         external_previews_factory: ExternalPreviewWindowControllerFactory,
         logging_configurator: LoggingConfigurator,
+        wakeup: Wakeup,
+        tracer: Tracer,
     ):
-        super().__init__(config)
+        super().__init__(config, wakeup, tracer)
         self._previews_storage = previews_storage
         self._external_previews_factory = external_previews_factory
         self._logging_configurator = logging_configurator
@@ -42,6 +52,38 @@ class PreviewSettingsWindowController(BaseController):
             Listener.Priority.Lowest,
         )
         self._position_controller.other_key += "Minimized"
+        self._settings_state = None
+        self._rendered_preview: RenderedLayout | None = None
+
+    def _on_config_update(self, config: Config, change: ConfigChange):
+        if change.only(*self._HIDDEN_FIELDS, *self._IN_PLACE_FIELDS) and self._update_in_place(change):
+            return
+        super()._on_config_update(config, change)
+
+    def _update_in_place(self, change: ConfigChange):
+        """
+        | Reflect config change in current window (menu labels, checkboxes, windows order)
+
+        :return: False, when window must be rebuilt
+        """
+        window = self._window_holder.window
+        if window is None or window.is_closed():
+            return False
+        config = map_config_to_view(self._config)
+        for menu in get_settings_menu(config):
+            # Custom menubar keys its buttons with text without shortcut characters
+            element = window.AllKeysDict.get(menu[0].replace(sg.MENU_SHORTCUT_CHARACTER, ""))
+            if element is None:
+                return False
+            element.update(menu_definition=menu)
+        if change.any("remember_positions"):
+            window[SettingsEvents.REMEMBER_POSITIONS].update(value=config.remember_positions)
+        if change.any("always_on_top"):
+            self._apply_keep_on_top()
+            for controller in self._external_previews_factory.values:
+                controller._apply_keep_on_top()
+        self._settings_state = self._get_settings_state()
+        return True
 
     def _update_log(self, text: str):
         if not self._window_holder.window:
@@ -54,6 +96,21 @@ class PreviewSettingsWindowController(BaseController):
         if not log:
             return
         log.write(text)
+        self._trim_log(log)
+
+    def _trim_log(self, log: sg.Multiline):
+        """
+        | Keep log panel as long as log buffer, the oldest lines are removed in batches
+        """
+        capacity = self._config.logging.panel_capacity
+        widget = log.Widget
+        lines = int(widget.index('end-1c').split('.')[0])
+        if lines <= capacity + capacity // 10:
+            return
+        state = widget.cget('state')
+        widget.configure(state='normal')
+        widget.delete('1.0', f'{lines - capacity + 1}.0')
+        widget.configure(state=state)
 
     def _get_layout(self):
         changed = False
@@ -96,15 +153,35 @@ class PreviewSettingsWindowController(BaseController):
                 map_log_config_to_view(self._config.logging),
                 self._logging_configurator.current_log
             )
+        self._rendered_preview = None
         if self._is_preview_integrated:
-            settings_layout += [[
-                get_preview_layout_frame(layout, self._config.last_preview_key or "")
-            ]]
+            frame = get_preview_layout_frame(layout, self._config.last_preview_key or "")
+            self._rendered_preview = RenderedLayout([[frame]])
+            settings_layout += [[get_preview_container(frame)]]
         return settings_layout
 
+    def _get_settings_state(self):
+        """
+        | Everything settings part of window depends on, except selected preview
+        | (previews compared as sets, since reload changes their order only)
+        """
+        config = map_config_to_view(self._config)
+        config.preview_key = None
+        return (
+            config,
+            frozenset(self._previews.get_group(self._config.last_preview_group_key)),
+            frozenset(self._previews.groups),
+            map_log_config_to_view(self._config.logging),
+            self._is_preview_integrated,
+            sg.theme(),
+        )
+
     def _set_layout(self, layout: LAYOUT_PROVIDER):
         if self._config.theme:
             sg.theme(self._config.theme)
+        settings_state = self._get_settings_state()
+        if settings_state == self._settings_state and (self._keep_external_preview() or self._replace_preview(layout)):
+            return
         self._position_controller.use_other = not self._is_preview_integrated
         window = self.make_window(
             self.make_layout(layout),
@@ -114,8 +191,71 @@ class PreviewSettingsWindowController(BaseController):
             log: sg.Multiline = window[SettingsEvents.LOG]
             log.set_vscroll_position(1)
         super()._set_window(window)
+        self._settings_state = settings_state
         self.open_external_preview()
 
+    def _keep_external_preview(self):
+        """
+        | Keep current window, when preview is shown in external window (it's refreshed by its own controller)
+
+        :return: False, when preview is integrated or window must be rebuilt
+        """
+        window = self._window_holder.window
+        if self._is_preview_integrated or window is None or window.is_closed():
+            return False
+        self._select_preview(window)
+        self.open_external_preview()
+        return True
+
+    def _replace_preview(self, layout: LAYOUT_PROVIDER):
+        """
+        | Replace integrated preview inside of current window, instead of window rebuild
+
+        :return: False, when window must be rebuilt
+        """
+        window = self._window_holder.window
+        if not self._config.reuse_window or not self._is_preview_integrated or \
+                window is None or window.is_closed():
+            return False
+        container = window.find_element(SettingsEvents.PREVIEW_CONTAINER, True)
+        if not container:
+            return False
+        key = self._config.last_preview_key or ""
+        try:
+            self._patch_preview([[get_preview_layout_frame(layout, key)]], window, container)
+        except Exception as e:
+            logging.warning(f"Preview can't be replaced in place, window will be rebuilt: {e}")
+            return False
+        self._select_preview(window)
+        return True
+
+    def _select_preview(self, window: sg.Window):
+        selector: sg.Combo = window[SettingsEvents.PREVIEW]
+        selected = next((item for item in selector.Values if item.value == self._config.last_preview_key), None)
+        if selected is not None:
+            selector.update(value=selected)
+
+    def _patch_preview(self, new_layout: LAYOUT, window: sg.Window, container: sg.Column):
+        """
+        | Apply changes to rendered preview, when its structure is the same, otherwise replace it
+        """
+        if self._rendered_preview:
+            try:
+                if self._rendered_preview.patch(new_layout):
+                    return
+            except Exception as e:
+                logging.debug(f"Preview can't be patched, it'll be replaced: {e}")
+        self._rendered_preview = None
+        try:
+            rendered = RenderedLayout(new_layout)
+            replace_content(window, container, new_layout)
+        except Exception as e:
+            logging.error(f"User defined layout can't be rendered: {e}")
+            key = self._config.last_preview_key or ""
+            rendered = RenderedLayout([[get_preview_layout_frame(lambda: get_exception_layout(e), key)]])
+            replace_content(window, container, rendered.layout)
+        self._rendered_preview = rendered
+
     def _make_window(
         self,
         layout: LAYOUT,
@@ -160,6 +300,12 @@ class PreviewSettingsWindowController(BaseController):
         for controller in self._external_previews_factory.values:
             controller.step()
 
+    def dispatch(self, window: sg.Window, event, values):
+        if super().dispatch(window, event, values):
+            return True
+        return any(controller.dispatch(window, event, values)
+                   for controller in tuple(self._external_previews_factory.values))
+
     def _handle_event(self, event, values):
         value = values.get(event) if values else None
         event = map_from_menu_view(event, SettingsEvents)
@@ -206,6 +352,14 @@ class PreviewSettingsWindowController(BaseController):
         elif event == SettingsEvents.ALWAYS_ON_TOP:
             self._config.always_on_top ^= True
             self._configs_storage.save()
+        elif event == SettingsEvents.LAZY_LOADING:
+            self._config.lazy_loading ^= True
+            self._configs_storage.save()
+        elif event == SettingsEvents.REUSE_WINDOW:
+            self._config.reuse_window ^= True
+            self._configs_storage.save()
+        elif event == SettingsEvents.SHOW_TIMINGS:
+            self._logging_configurator.write(f"Timings (ms, latest {Tracer.WINDOW} of each):\n{self._tracer.summary()}\n")
         elif event is None:
             sys.exit()
         else:
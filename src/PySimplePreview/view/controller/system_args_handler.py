@@ -4,25 +4,72 @@ from pathlib import Path
 
 import PySimplePreview
 from PySimplePreview.domain.model.config import Config, is_valid_project
+from PySimplePreview.domain.model.tracing import Tracer
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog="PySimplePreview",
+        description="Realtime (live/hot) preview of PySimpleGUI layouts",
+    )
+    parser.add_argument('-v', '--version', action='version', version=PySimplePreview.__version__)
+    parser.add_argument(
+        '-P', '--project-path', action='store',
+        help="Sets path to root module (__init__), single .py module, or directory as current project"
+    )
+    parser.add_argument(
+        '-p', '--preview', action='store',
+        help="Overrides current preview"
+    )
+    parser.add_argument(
+        '-F', '--fork-server', action='store_true',
+        help="Keep pre-warmed process and fork app from it on full reload instead of restarting "
+             "interpreter (POSIX only)"
+    )
+    parser.add_argument(
+        '-C', '--check', action='store_true',
+        help="Build and render every preview of project in hidden windows, report failures "
+             "and timings, then exit with non-zero status if anything failed (for CI)"
+    )
+    parser.add_argument(
+        '-E', '--export', action='store', metavar='DIR',
+        help="Same as --check, but also saves screenshot of every preview to DIR as PNG (requires Pillow)"
+    )
+    parser.add_argument(
+        '-G', '--group', action='store',
+        help="Check/export only previews of this group"
+    )
+    parser.add_argument(
+        '-B', '--baseline', action='store', metavar='DIR',
+        help="Same as --check, but also compares screenshots with ones stored in DIR, "
+             "previews of unchanged modules are skipped, missing ones are added to DIR "
+             "(requires Pillow and numpy)"
+    )
+    parser.add_argument(
+        '--tolerance', action='store', type=float, default=0.0,
+        help="Part of pixels, which may differ from baseline (default: %(default)s)"
+    )
+    parser.add_argument(
+        '--update-baseline', action='store_true',
+        help="Replace baseline screenshots with changed ones"
+    )
+    parser.add_argument(
+        '-W', '--workers', action='store', type=int, default=1,
+        help="Number of processes to check/export previews with (default: %(default)s)"
+    )
+    parser.add_argument(
+        '-T', '--trace', action='store', metavar='FILE',
+        help="Append timings of file watching, imports, layout builds and window creation "
+             "to FILE as JSON lines"
+    )
+    return parser
 
 
 class SystemArgsHandler:
-    def __init__(self, config: Config):
-        parser = argparse.ArgumentParser(
-            prog="PySimplePreview",
-            description="Realtime (live/hot) preview of PySimpleGUI layouts",
-        )
+    def __init__(self, config: Config, tracer: Tracer):
         self._config = config
-        self.parser = parser
-        parser.add_argument('-v', '--version', action='version', version=PySimplePreview.__version__)
-        parser.add_argument(
-            '-P', '--project-path', action='store',
-            help="Sets path to root module (__init__), single .py module, or directory as current project"
-        )
-        parser.add_argument(
-            '-p', '--preview', action='store',
-            help="Overrides current preview"
-        )
+        self._tracer = tracer
+        self.parser = make_parser()
 
     def run(self):
         args = self.parser.parse_args()
@@ -36,6 +83,8 @@ class SystemArgsHandler:
         if args.preview:
             print(args.preview)
             self._config.last_preview_key = args.preview
+        if args.trace:
+            self._tracer.trace_to(Path(args.trace))
 
         # There is no configuration save to imitate "virtual" configuration
         # But any configuration change will also persist changes made here
@@ -1,5 +1,7 @@
 import PySimpleGUI as sg
 
+from PySimplePreview.domain.model.preview import LAYOUT
+
 
 class WindowHolder:
     def __init__(self):
@@ -14,16 +16,17 @@ class WindowHolder:
         self._new_window = new_window
 
     def step(self):
-        if self._new_window:
-            result = self._read(self._new_window, 0)
-            self._new_window.set_alpha(1)
-            self.close()
-            self._window = self._new_window
-            self._new_window = None
-            return result
-        if not self._window or self.window.was_closed():
+        if not self._new_window:
             return None
-        return self._read(self._window, 1)
+        result = self._read(self._new_window, 0)
+        self._new_window.set_alpha(1)
+        self.close()
+        self._window = self._new_window
+        self._new_window = None
+        return result
+
+    def owns(self, window: sg.Window):
+        return window is not None and window is self._window
 
     def _read(self, window, timeout):
         return window.read(timeout)
@@ -31,3 +34,29 @@ class WindowHolder:
     def close(self):
         if self._window:
             self.window.close()
+
+
+def replace_content(window: sg.Window, container: sg.Column, layout: LAYOUT):
+    """
+    | Replace everything inside **container** of finalized **window** with **layout**,
+    | window itself (and all other elements) stays untouched
+    """
+    for row in container.Rows:
+        for element in row:
+            _forget_keys(window, element)
+            element.ParentRowFrame.destroy()
+    container.Rows = []
+    window.extend_layout(container, layout)
+    # New content is wrapped into column, which is registered as window's row,
+    # move it into container, so values and keys are collected from there
+    row = window.Rows.pop()
+    row[0].expand(True, True)
+    container.Rows = [row]
+
+
+def _forget_keys(window: sg.Window, element: sg.Element):
+    for row in getattr(element, 'Rows', ()):
+        for child in row:
+            _forget_keys(window, child)
+    if element.Key is not None and window.AllKeysDict.get(element.Key) is element:
+        del window.AllKeysDict[element.Key]
@@ -1,10 +1,13 @@
 import punq
 
+from PySimplePreview.view.checker import PreviewsChecker
 from PySimplePreview.view.controller.external_preview import ExternalPreviewWindowController
 from PySimplePreview.view.controller.external_preview_factory import ExternalPreviewWindowControllerFactory
 from PySimplePreview.view.controller.preview_settings import PreviewSettingsWindowController
 from PySimplePreview.view.controller.system_args_handler import SystemArgsHandler
 from PySimplePreview.view.log import LoggingConfigurator
+from PySimplePreview.view.positions_pruner import PreviewPositionsPruner
+from PySimplePreview.view.scheduler import Scheduler
 
 
 def register_view(container: punq.Container):
@@ -13,3 +16,6 @@ def register_view(container: punq.Container):
     container.register(ExternalPreviewWindowControllerFactory, scope=punq.Scope.singleton)
     container.register(SystemArgsHandler)
     container.register(LoggingConfigurator, scope=punq.Scope.singleton)
+    container.register(Scheduler, scope=punq.Scope.singleton)
+    container.register(PreviewPositionsPruner, scope=punq.Scope.singleton)
+    container.register(PreviewsChecker)
@@ -0,0 +1,180 @@
+import threading
+from dataclasses import dataclass
+from queue import Queue
+
+from PySimplePreview.domain.interactor.supervisor import ExecutionTimeout, Interrupted, format_thread_stack, \
+    interrupt_thread
+from PySimplePreview.domain.model.preview import LAYOUT_PROVIDER, LAYOUT
+from PySimplePreview.domain.model.tracing import Tracer
+from PySimplePreview.domain.model.wakeup import Wakeup
+
+
+class LayoutBuildTimeout(ExecutionTimeout):
+    pass
+
+
+@dataclass(frozen=True)
+class BuiltLayout:
+    """
+    | Result of layout provider called by :class:`LayoutBuilder`
+    """
+    generation: int
+    layout: LAYOUT | None = None
+    error: Exception | None = None
+
+    def provider(self) -> LAYOUT:
+        """
+        | Use as layout provider on UI thread, so errors are handled same way as for synchronous build
+        """
+        if self.error:
+            raise self.error
+        return self.layout
+
+
+class _Build:
+    def __init__(self, generation: int, provider: LAYOUT_PROVIDER):
+        self.generation = generation
+        self.provider = provider
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.result: BuiltLayout | None = None
+        self.awaited = True
+        self.claimed = False
+        self.timer: threading.Timer | None = None
+        self.thread: threading.Thread | None = None
+
+
+class LayoutBuilder:
+    """
+    | Calls user's layout providers on worker threads, so slow ones don't freeze app windows
+    | Build result is put into controller's **queue** (as :class:`BuiltLayout`),
+    | only the latest build is delivered: older ones considered stale
+    | Build exceeded its timeout is replaced with error showing where it was stuck and abandoned,
+    | its thread is interrupted on best-effort basis (see :func:`interrupt_thread`)
+    | At most :attr:`MAX_RUNNING` builds run at once (stuck ones included), the latest build requested
+    | beyond it waits for free slot, so abandoned builds don't pile up
+    | Providers run off the Tk thread, so they must only make elements, not touch Tk (windows, popups, images)
+    """
+    PLACEHOLDER_DELAY = 0.1  # Builds faster than this are returned immediately, with no placeholder shown
+    MAX_RUNNING = 2
+
+    def __init__(self, queue: Queue, wakeup: Wakeup, tracer: Tracer):
+        self._queue = queue
+        self._wakeup = wakeup
+        self._tracer = tracer
+        self._generation = 0
+        self._running: set[_Build] = set()
+        self._waiting: _Build | None = None
+        self._lock = threading.Lock()
+
+    def build(self, provider: LAYOUT_PROVIDER, timeout: int) -> BuiltLayout | None:
+        """
+        | Start build of layout, which must be finished in **timeout** ms
+
+        :return: Result, if build finished quickly, otherwise None (result will be put into queue later)
+        """
+        with self._lock:
+            self._generation += 1
+            build = _Build(self._generation, provider)
+            if len(self._running) < self.MAX_RUNNING:
+                self._running.add(build)
+            else:
+                build.awaited = False
+                self._waiting = build  # Build waited before is stale already
+        build.timer = threading.Timer(timeout / 1000, self._on_timeout, args=(build, timeout))
+        build.timer.daemon = True
+        build.timer.start()
+        if not build.awaited:
+            return None
+        self._prepare_thread(build).start()
+        build.done.wait(self.PLACEHOLDER_DELAY)
+        with build.lock:
+            build.awaited = False
+            if build.result is None or build.claimed:
+                return None
+            build.claimed = True
+        build.timer.cancel()
+        return build.result
+
+    def is_current(self, result: BuiltLayout):
+        return result.generation == self._generation
+
+    def cancel(self):
+        """
+        | Make every started build stale
+        """
+        with self._lock:
+            self._generation += 1
+
+    def _prepare_thread(self, build: _Build):
+        build.thread = threading.Thread(
+            target=self._run, args=(build,),
+            name=f"LayoutBuilder-{build.generation}", daemon=True,
+        )
+        return build.thread
+
+    def _run(self, build: _Build):
+        try:
+            try:
+                with self._tracer.span("layout.build"):
+                    result = BuiltLayout(build.generation, build.provider())
+            except Exception as e:
+                result = BuiltLayout(build.generation, error=e)
+            with build.lock:
+                build.result = result
+                if build.awaited:
+                    build.done.set()
+                    return
+            build.timer.cancel()
+            self._deliver(build, result)
+        except Interrupted:
+            pass  # Timeout already reported
+        finally:
+            self._release(build)
+
+    def _release(self, build: _Build):
+        """
+        | Free slot of finished build and start waiting build in it
+        """
+        with self._lock:
+            self._running.discard(build)
+            waiting = self._waiting
+            if waiting is None or len(self._running) >= self.MAX_RUNNING:
+                return
+            self._waiting = None
+            if waiting.claimed or waiting.generation != self._generation:
+                waiting.timer.cancel()
+                return  # Timed out while waiting or made stale
+            self._running.add(waiting)
+            thread = self._prepare_thread(waiting)
+        thread.start()
+
+    def _on_timeout(self, build: _Build, timeout: int):
+        with self._lock:
+            if self._waiting is build:
+                self._waiting = None
+            thread = build.thread
+        if thread is None:
+            error = LayoutBuildTimeout(
+                f"Layout wasn't built in {timeout} ms: "
+                f"previous builds are still running (at most {self.MAX_RUNNING} at once)"
+            )
+        else:
+            error = LayoutBuildTimeout(f"Layout wasn't built in {timeout} ms", format_thread_stack(thread))
+        if self._deliver(build, BuiltLayout(build.generation, error=error)) and thread is not None:
+            interrupt_thread(thread)
+
+    def _deliver(self, build: _Build, result: BuiltLayout):
+        """
+        | Put result into queue, unless result of this build already taken
+
+        :return: False, if result already taken
+        """
+        with build.lock:
+            if build.claimed:
+                return False
+            build.claimed = True
+        if self.is_current(result):
+            self._queue.put_nowait(result)
+            self._wakeup.notify()
+        return True
@@ -0,0 +1,161 @@
+import enum
+import logging
+import typing
+from dataclasses import dataclass
+
+import PySimpleGUI as sg
+
+from PySimplePreview.domain.model.preview import LAYOUT
+
+# Element properties, which can be changed with `update()` call (property -> update parameter),
+# change of any other property requires window rebuild
+UPDATABLE_PROPERTIES: dict[type, dict[str, str]] = {
+    sg.Text: dict(DisplayText='value', TextColor='text_color', BackgroundColor='background_color', Font='font'),
+    sg.Button: dict(ButtonText='text', ButtonColor='button_color', Disabled='disabled'),
+    sg.Input: dict(DefaultText='value', TextColor='text_color', BackgroundColor='background_color',
+                   Disabled='disabled'),
+    sg.Multiline: dict(DefaultText='value', TextColor='text_color', BackgroundColor='background_color',
+                       Disabled='disabled'),
+    sg.Checkbox: dict(Text='text', InitialState='value', TextColor='text_color',
+                      BackgroundColor='background_color', Disabled='disabled'),
+    sg.Radio: dict(Text='text', InitialState='value', Disabled='disabled'),
+    sg.Combo: dict(Values='values', DefaultValue='value', Disabled='disabled'),
+    sg.Listbox: dict(Values='values'),
+    sg.Spin: dict(Values='values', DefaultValue='value', Disabled='disabled'),
+    sg.Slider: dict(DefaultValue='value', Range='range', Disabled='disabled'),
+    sg.Frame: dict(Title='value'),
+}
+_COMMON_PROPERTIES = dict(_visible='visible')
+_CHILDREN = 'Rows'
+_IGNORED_PROPERTIES = {_CHILDREN, 'ContainerElemementNumber'}  # Global counter, differs for each container
+
+ELEMENT_PATH: typing.TypeAlias = tuple[tuple[int, int], ...]
+
+
+@dataclass(frozen=True)
+class ElementSnapshot:
+    type: type
+    properties: tuple[tuple[str, typing.Any], ...]
+    children: tuple[tuple['ElementSnapshot', ...], ...]
+
+
+def take_snapshot(layout: LAYOUT) -> tuple[tuple[ElementSnapshot, ...], ...]:
+    """
+    | Capture properties of layout elements, must be called before layout rendered,
+    | since rendering adds lots of tkinter-related state
+    """
+    return tuple(tuple(_snapshot_element(element) for element in row) for row in layout)
+
+
+def _snapshot_element(element: sg.Element):
+    properties = vars(element)
+    return ElementSnapshot(
+        type(element),
+        tuple((name, _freeze(value)) for name, value in properties.items()
+              if name not in _IGNORED_PROPERTIES),
+        take_snapshot(properties.get(_CHILDREN) or ()),
+    )
+
+
+def _freeze(value):
+    if value is None or isinstance(value, (str, int, float, bytes, enum.Enum)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((_freeze(key), _freeze(item)) for key, item in value.items())
+    return type(value)  # Arbitrary objects are compared by type only
+
+
+def diff_layouts(old, new) -> list[tuple[ELEMENT_PATH, dict[str, str]]] | None:
+    """
+    | Find `update()` calls, which turns layout captured in **old** snapshot into **new** one
+
+    :return: Element paths with update parameters (mapped to properties to take values from),
+        or None if layout structure changed
+    """
+    if len(old) != len(new):
+        return None
+    changes = []
+    for row_index, (old_row, new_row) in enumerate(zip(old, new)):
+        if len(old_row) != len(new_row):
+            return None
+        for column_index, (old_element, new_element) in enumerate(zip(old_row, new_row)):
+            path = ((row_index, column_index),)
+            if old_element.type is not new_element.type:
+                return None
+            updates = _diff_properties(old_element, new_element)
+            if updates is None:
+                return None
+            if updates:
+                changes.append((path, updates))
+            children_changes = diff_layouts(old_element.children, new_element.children)
+            if children_changes is None:
+                return None
+            changes.extend((path + child_path, updates) for child_path, updates in children_changes)
+    return changes
+
+
+def _diff_properties(old: ElementSnapshot, new: ElementSnapshot):
+    if old.properties == new.properties:
+        return dict()
+    updatable = _get_updatable_properties(new.type)
+    old_properties = dict(old.properties)
+    new_properties = dict(new.properties)
+    if old_properties.keys() != new_properties.keys():
+        return None
+    updates = dict()
+    for name, value in new_properties.items():
+        if old_properties[name] == value:
+            continue
+        if name not in updatable:
+            return None
+        updates[updatable[name]] = name
+    if 'values' in updates and 'DefaultValue' in new_properties:
+        # New values resets selection
+        updates.setdefault('value', 'DefaultValue')
+    return updates
+
+
+def _get_updatable_properties(element_type: type):
+    for cls in element_type.__mro__:
+        if cls in UPDATABLE_PROPERTIES:
+            return UPDATABLE_PROPERTIES[cls] | _COMMON_PROPERTIES
+    return _COMMON_PROPERTIES
+
+
+def _find_element(layout: LAYOUT, path: ELEMENT_PATH) -> sg.Element:
+    (row, column), *rest = path
+    element = layout[row][column]
+    return _find_element(getattr(element, _CHILDREN), tuple(rest)) if rest else element
+
+
+class RenderedLayout:
+    """
+    | Layout, which is (or about to be) shown in window,
+    | allows to apply changes from newly built layout of same structure in place
+    """
+
+    def __init__(self, layout: LAYOUT):
+        self.layout = layout
+        self._snapshot = take_snapshot(layout)
+
+    def patch(self, new_layout: LAYOUT):
+        """
+        | Update rendered elements with properties of **new_layout** elements
+
+        :return: False, if layout structure changed, so window must be rebuilt
+        """
+        new_snapshot = take_snapshot(new_layout)
+        changes = diff_layouts(self._snapshot, new_snapshot)
+        if changes is None:
+            return False
+        for path, updates in changes:
+            new_element = _find_element(new_layout, path)
+            _find_element(self.layout, path).update(**{
+                parameter: getattr(new_element, name) for parameter, name in updates.items()
+            })
+        if changes:
+            logging.debug(f"Layout patched with {len(changes)} element update(s)")
+        self._snapshot = new_snapshot
+        return True
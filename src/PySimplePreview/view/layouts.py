@@ -11,6 +11,34 @@ from PySimplePreview.view.contracts import SettingsEvents
 from PySimplePreview.view.models import ConfigViewDTO, ListItem, LogConfigViewDTO, map_menu_to_view, map_on_off
 
 
+def get_settings_menu(config: ConfigViewDTO):
+    """
+    | Menu definition, each top level item is rendered as button menu keyed with its text
+    """
+    return [
+        ["&Window", [
+            map_menu_to_view(
+                f"Always on &top ({map_on_off(config.always_on_top).upper()})",
+                SettingsEvents.ALWAYS_ON_TOP,
+            ),
+            map_menu_to_view(
+                f"&Persist size and location ({map_on_off(config.remember_positions).upper()})",
+                SettingsEvents.REMEMBER_POSITIONS,
+            ),
+            map_menu_to_view(
+                f"&Reuse window on reload ({map_on_off(config.reuse_window).upper()})",
+                SettingsEvents.REUSE_WINDOW,
+            ),
+        ]],
+        ["P&roject", [
+            map_menu_to_view(
+                f"&Lazy loading ({map_on_off(config.lazy_loading).upper()})",
+                SettingsEvents.LAZY_LOADING,
+            ),
+        ]],
+    ]
+
+
 def get_settings_layout(
         config: ConfigViewDTO,
         previews: tuple[ListItem, ...],
@@ -18,18 +46,7 @@ def get_settings_layout(
 ):
     return [[
         sg.MenubarCustom(
-            [
-                ["&Window", [
-                    map_menu_to_view(
-                        f"Always on &top ({map_on_off(config.always_on_top).upper()})",
-                        SettingsEvents.ALWAYS_ON_TOP,
-                    ),
-                    map_menu_to_view(
-                        f"&Persist size and location ({map_on_off(config.remember_positions).upper()})",
-                        SettingsEvents.REMEMBER_POSITIONS,
-                    ),
-                ]],
-            ],
+            get_settings_menu(config),
             text_color=sg.theme_button_color_text(),
             bar_text_color=sg.theme_button_color_text(),
             background_color=sg.theme_button_color_background(),
@@ -49,8 +66,8 @@ def get_settings_layout(
                 config.reload_all,
                 key=SettingsEvents.RELOAD_ALL,
                 tooltip="On any change whole program will be reloaded (not recommended)"
-                        "\nUse this only if your layout depends on other module that is"
-                        "\nchanged at preview time",
+                        "\nModules importing changed one are reloaded anyway, use this only"
+                        "\nif your layout depends on other module in some implicit way",
                 disabled=not config.is_package,
                 enable_events=True,
             ),
@@ -113,6 +130,14 @@ def get_preview_layout_frame(content: LAYOUT_PROVIDER, name=""):
     return sg.Frame("Preview" + f' for {name}' if name else '', expand_x=True, expand_y=True, layout=layout)
 
 
+def get_preview_container(frame: sg.Frame):
+    return sg.Column(
+        [[frame]],
+        key=SettingsEvents.PREVIEW_CONTAINER,
+        expand_x=True, expand_y=True, p=0,
+    )
+
+
 def get_exception_layout(e: Exception):
     message = str(e) + "\n".join(traceback.format_tb(e.__traceback__))
     return [
@@ -130,6 +155,10 @@ def get_nocontent_layout():
     return [[sg.Text("No content found")]]
 
 
+def get_building_layout():
+    return [[sg.Text("Building layout…")]]
+
+
 def get_unpacked_layout(
         content: LAYOUT_PROVIDER,
         no_content: LAYOUT_PROVIDER = get_nocontent_layout,
@@ -156,7 +185,12 @@ def get_log_layout(config: LogConfigViewDTO, log: str):
                 enable_events=True, s=9, p=0,
                 key=SettingsEvents.LOGGING_LEVEL,
             ),
-            sg.Text(s=18, p=0),
+            sg.Button(
+                "Timings", font=("Consolas", 8), p=((6, 0), 0),
+                tooltip="Print latest durations of file watching, imports, layout builds and window creation",
+                key=SettingsEvents.SHOW_TIMINGS,
+            ),
+            sg.Text(s=10, p=0),
             sg.Text("Write to:", p=((0, 2), 0)),
             sg.DropDown(
                 config.write_to_options, config.write_to,
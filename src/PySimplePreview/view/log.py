@@ -1,10 +1,13 @@
-import io
 import logging
 import sys
+import time
 import typing
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
 
 from PySimplePreview.data.config_storage import ConfigStorage
+from PySimplePreview.domain.model.config import Config, ConfigChange
 from PySimplePreview.domain.model.event import InvokableEvent
 from PySimplePreview.domain.model.log_config import LogConfig
 
@@ -14,24 +17,63 @@ class _InfoOrLesser(logging.Filter):
         return record.levelno <= logging.INFO
 
 
-class ObservableStream(io.StringIO):
-    def __init__(self):
-        super().__init__()
+@dataclass(frozen=True)
+class LogEntry:
+    created: float
+    level: int
+    message: str
+
+    @property
+    def text(self):
+        return self.message + "\n"
+
+
+class LogBuffer(logging.Handler):
+    """
+    | Latest log records for log panel, the oldest ones are dropped once **capacity** exceeded
+    | Every new entry is published with **on_write** as text, so panel can be fed incrementally
+    """
+
+    def __init__(self, capacity: int = 1000):
+        super().__init__(logging.NOTSET)
+        self._entries: deque[LogEntry] = deque(maxlen=capacity)
         self._on_write = InvokableEvent[typing.Callable[[str], None]]()
         self.on_write = self._on_write.base
 
-    def write(self, __s: str) -> int:
-        result = super().write(__s)
-        self._on_write.invoke(__s)
-        return result
+    @property
+    def capacity(self):
+        return self._entries.maxlen
+
+    @capacity.setter
+    def capacity(self, value: int):
+        if value != self._entries.maxlen:
+            with self.lock:
+                self._entries = deque(self._entries, maxlen=value)
+
+    @property
+    def entries(self):
+        with self.lock:
+            return tuple(self._entries)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.add(LogEntry(record.created, record.levelno, self.format(record)))
+        except Exception:
+            self.handleError(record)
+
+    def add(self, entry: LogEntry):
+        with self.lock:
+            self._entries.append(entry)
+        self._on_write.invoke(entry.text)
+
+    def getvalue(self):
+        return "".join(entry.text for entry in self.entries)
 
 
 class _Steams:
     def __init__(self):
-        self._observable_stream = ObservableStream()
-        self._stream = logging.StreamHandler(self._observable_stream)
-        self._stream.setLevel(logging.NOTSET)
-        self._stream.setFormatter(logging.Formatter(
+        self._buffer = LogBuffer()
+        self._buffer.setFormatter(logging.Formatter(
             "[%(asctime)s][%(levelname)s] %(message)s",
             datefmt="%H:%M:%S"
         ))
@@ -53,17 +95,17 @@ class _Steams:
 
     @property
     def independent(self):
-        return self._observable_stream
+        return self._buffer
 
     @property
     def console(self):
         self._close_file()
-        return self._stream, self._console_stream, self._console_err_stream
+        return self._buffer, self._console_stream, self._console_err_stream
 
     @property
     def nowhere(self):
         self._close_file()
-        return (self._stream,)
+        return (self._buffer,)
 
     def file(self, path: Path):
         if not self._file_name or not path.samefile(self._file_name):
@@ -73,22 +115,37 @@ class _Steams:
                 path.parent.mkdir(exist_ok=True)
                 path.open("a").close()
             self._file = logging.FileHandler(path, encoding="utf-8")
-        return self._stream, self._file
+        return self._buffer, self._file
 
 
 class LoggingConfigurator:
     def __init__(self, config_storage: ConfigStorage):
         self._config_storage = config_storage
         self._streams = _Steams()
-        self._config_storage.on_update += lambda _: self.setup()
+        self._config_storage.on_update += self._on_config_update
         self.on_write = self._streams.independent.on_write
 
+    def _on_config_update(self, _: Config, change: ConfigChange):
+        if change.any("logging.write_to", "logging.file_path"):
+            self.setup()
+        elif change.any("logging.level"):
+            logging.getLogger().setLevel(self._config_storage.config.logging.level.value)
+        if change.any("logging.panel_capacity"):
+            self._streams.independent.capacity = self._config_storage.config.logging.panel_capacity
+
     @property
     def current_log(self):
         return self._streams.independent.getvalue()
 
+    def write(self, text: str):
+        """
+        | Append **text** to log panel only, regardless of logging level and destination
+        """
+        self._streams.independent.add(LogEntry(time.time(), logging.INFO, text.rstrip("\n")))
+
     def setup(self):
         config = self._config_storage.config.logging
+        self._streams.independent.capacity = config.panel_capacity
         handlers = tuple()
         if config.write_to == LogConfig.LoggingDestination.CONSOLE:
             handlers = self._streams.console
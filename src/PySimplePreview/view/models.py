@@ -35,6 +35,8 @@ class ConfigViewDTO:
     reload_all: bool = False
     remember_positions: bool = True
     always_on_top: bool = True
+    lazy_loading: bool = False
+    reuse_window: bool = True
     integrated_preview: bool = True
     integrated_preview_disabled: bool = False
     projects: tuple[str, ...] = tuple()
@@ -49,6 +51,8 @@ def map_config_to_view(config: Config):
         current_project=str(config.current_project) if config.current_project else None,
         theme=config.theme or sg.CURRENT_LOOK_AND_FEEL,
         always_on_top=config.always_on_top,
+        lazy_loading=config.lazy_loading,
+        reuse_window=config.reuse_window,
         reload_all=config.reload_all,
         remember_positions=config.remember_positions,
         integrated_preview=config.integrated_preview,
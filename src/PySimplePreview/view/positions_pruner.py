@@ -0,0 +1,49 @@
+import logging
+from pathlib import Path
+
+from PySimplePreview.data.config_storage import ConfigStorage
+from PySimplePreview.domain.interactor.abc.module_loader import ModuleLoader
+from PySimplePreview.domain.interactor.previews_manager import PreviewsManager
+from PySimplePreview.domain.model.event import Listener
+from PySimplePreview.domain.model.source_index import SourceIndex
+from PySimplePreview.view.controller.external_preview import ExternalPreviewWindowController
+
+
+class PreviewPositionsPruner:
+    """
+    | Drops stored sizes of preview windows, when package (re)load ends without their previews
+    | Only previews seen during this session are pruned, and only if their module is loaded (or deleted),
+    | so module failed to import keeps sizes of its previews
+    | Capacity of positions storage limits the rest (e.g. previews removed while app wasn't running)
+    """
+
+    def __init__(
+        self,
+        loader: ModuleLoader,
+        previews: PreviewsManager,
+        sources: SourceIndex,
+        config: ConfigStorage,
+    ):
+        self._previews = previews
+        self._sources = sources
+        self._config_storage = config
+        self._seen: dict[str, Path] = dict()
+        loader.on_event += Listener(self._on_module_event, Listener.Priority.Lowest)
+
+    def _on_module_event(self, event: ModuleLoader.EventType, path: Path):
+        if event == ModuleLoader.EventType.PackageReloadEnded:
+            self.prune()
+
+    def prune(self):
+        registered = set(self._previews.previews)
+        removed = [
+            key for key, path in self._seen.items()
+            if key not in registered and (self._sources.get(path) is not None or not path.exists())
+        ]
+        for key in removed:
+            del self._seen[key]
+        for key in registered:
+            self._seen[key] = self._previews.path_of(key)
+        if removed:
+            logging.info(f"Forgetting window sizes of {len(removed)} removed preview(s)")
+            self._config_storage.remove_positions(map(ExternalPreviewWindowController.position_key_of, removed))
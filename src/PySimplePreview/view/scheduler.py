@@ -0,0 +1,59 @@
+import logging
+from contextlib import suppress
+
+import PySimpleGUI as sg
+
+from PySimplePreview.domain.interactor.abc.files_observer import ProjectObserver
+from PySimplePreview.domain.interactor.abc.module_loader import ModuleLoader
+from PySimplePreview.domain.model.wakeup import Wakeup
+from PySimplePreview.view.controller.preview_settings import PreviewSettingsWindowController
+
+
+class Scheduler:
+    IDLE_TIMEOUT = 500
+    WAKEUP_EVENT = "Wakeup"
+
+    def __init__(
+        self,
+        runner: PreviewSettingsWindowController,
+        project_observer: ProjectObserver,
+        module_loader: ModuleLoader,
+        wakeup: Wakeup,
+    ):
+        self._runner = runner
+        self._project_observer = project_observer
+        self._module_loader = module_loader
+        self._wakeup = wakeup
+        self._wakeup.on_notify += self._interrupt_read
+
+    def _interrupt_read(self):
+        # May be called from watchdog thread, window.write_event_value is thread safe
+        window = self._runner.window
+        if window is None:
+            return
+        with suppress(Exception):
+            window.write_event_value(self.WAKEUP_EVENT, None)
+
+    @property
+    def _timeout(self):
+        if self._module_loader.has_pending:
+            return 0
+        delay = self._project_observer.dispatch_delay
+        if delay is None:
+            return self.IDLE_TIMEOUT
+        return min(delay, self.IDLE_TIMEOUT)
+
+    def step(self):
+        self._wakeup.reset()
+        self._project_observer.dispatch_events()
+        if self._module_loader.load_pending():
+            self._runner.refresh_layout()
+        self._runner.step()
+        if self._runner.window is None:
+            self._wakeup.wait(self._timeout)
+            return
+        window, event, values = sg.read_all_windows(self._timeout)
+        if window is None or event == self.WAKEUP_EVENT:
+            return
+        if not self._runner.dispatch(window, event, values):
+            logging.debug(f"Event '{event}' from unknown window skipped")
@@ -0,0 +1,84 @@
+import enum
+import json
+import logging
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+
+class DiffStatus(enum.Enum):
+    SAME = "same"
+    CHANGED = "changed"
+    NEW = "new"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+@dataclass
+class DiffResult:
+    key: str
+    status: DiffStatus
+    ratio: float = 0.0
+
+
+def get_diff_ratio(expected: Path, actual: Path) -> float:
+    """
+    | Part of pixels which differ between two images (1.0 when sizes differ)
+    """
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(expected) as expected_image, Image.open(actual) as actual_image:
+        expected_pixels = np.asarray(expected_image.convert('RGBA'))
+        actual_pixels = np.asarray(actual_image.convert('RGBA'))
+    if expected_pixels.shape != actual_pixels.shape:
+        return 1.0
+    return float(np.any(expected_pixels != actual_pixels, axis=-1).mean())
+
+
+class VisualBaseline:
+    """
+    | Directory of reference screenshots (named after preview keys),
+    | with hashes of modules previews were rendered from
+    """
+    MANIFEST_NAME = "baseline.json"
+
+    def __init__(self, directory: Path, tolerance: float = 0.0):
+        self.directory = directory
+        self.tolerance = tolerance
+        self._manifest_path = directory / self.MANIFEST_NAME
+        self._digests: dict[str, str] = dict()
+        try:
+            self._digests = json.loads(self._manifest_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"Baseline manifest can't be loaded, all previews will be rendered: {e}")
+
+    def is_unchanged(self, key: str, image_name: str, digest: str):
+        """
+        | Preview's module is the same, as baseline was made of, so there is no need to render it
+        """
+        return self._digests.get(key) == digest and (self.directory / image_name).exists()
+
+    def compare(self, key: str, screenshot: Path, digest: str, update=False):
+        baseline_image = self.directory / screenshot.name
+        if not baseline_image.exists():
+            self._accept(key, screenshot, digest)
+            return DiffResult(key, DiffStatus.NEW, 1.0)
+        ratio = get_diff_ratio(baseline_image, screenshot)
+        if ratio <= self.tolerance:
+            self._digests[key] = digest
+            return DiffResult(key, DiffStatus.SAME, ratio)
+        if update:
+            self._accept(key, screenshot, digest)
+        return DiffResult(key, DiffStatus.CHANGED, ratio)
+
+    def _accept(self, key: str, screenshot: Path, digest: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(screenshot, self.directory / screenshot.name)
+        self._digests[key] = digest
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._manifest_path.write_text(json.dumps(self._digests, indent=2, sort_keys=True), encoding='utf-8')